@@ -0,0 +1,70 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Compressed JSON (``.jz``) and binary (``.jzb``) files versus the SQLite storage backend: load,
+selection and single edit.
+
+    python benchmarks/backends.py
+"""
+
+from itertools import count
+
+from common import measure, report, synthetic_entries, temporary_pad
+from pad_configuration import Configuration
+
+_keys = count()
+
+
+def main():
+    rows = []
+    for size in [1000, 10000]:
+        entries = synthetic_entries(size)
+        for format in ["jz", "binary", "sqlite"]:
+            with temporary_pad(entries, format=format):
+                def cold(lazy):
+                    Configuration.clear_cache()
+                    return Configuration("PAD", lazy=lazy)
+
+                def select():
+                    config = cold(True)
+                    return config.query(collaboration="cms", sqrt_s=13, min_lumi=100)
+
+                config = Configuration("PAD")
+                analysis = config[size // 2].name
+                rows += [
+                    (f"{format}: cold load", size, measure(lambda: cold(False), repeat=3)),
+                    (f"{format}: cold lazy load", size, measure(lambda: cold(True), repeat=3)),
+                    (f"{format}: warm load", size,
+                     measure(lambda: Configuration("PAD"), number=20)),
+                    (f"{format}: lazy load + query", size, measure(select, repeat=3)),
+                    (f"{format}: add_bibtex_info", size, measure(
+                        lambda: config.add_bibtex_info(analysis, f"@misc{{key_{next(_keys)},}}"),
+                        repeat=3,
+                    )),
+                ]
+    report("Storage formats", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Adding a large number of entries: ``import_entries`` streaming a NDJSON file versus
+``add_entry`` with a list of entries, and ``export_entries`` of the resulting database.
+
+    python benchmarks/bulk_import.py
+"""
+
+import json
+import os
+import tempfile
+
+from common import measure, report, synthetic_entries, temporary_pad
+from pad_configuration import Configuration
+
+
+def main():
+    rows = []
+    for size in [1000, 10000]:
+        entries = synthetic_entries(2 * size)
+        existing, new = entries[:size], entries[size:]
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "entries.ndjson")
+            with open(source, "w") as f:
+                for entry in new:
+                    f.write(json.dumps(entry) + "\n")
+
+            def import_entries():
+                with temporary_pad(existing):
+                    Configuration("PAD").import_entries(source)
+
+            def add_entry():
+                with temporary_pad(existing):
+                    Configuration.add_entry("PAD", new)
+
+            rows += [
+                ("import_entries, NDJSON file", size, measure(import_entries, repeat=3)),
+                ("add_entry, list of entries", size, measure(add_entry, repeat=3)),
+            ]
+            config = Configuration("PAD", [Configuration._make_entry(x) for x in entries])
+            output = os.path.join(directory, "export.ndjson")
+            rows.append(
+                ("export_entries", 2 * size, measure(lambda: config.export_entries(output), repeat=3))
+            )
+    report("Bulk import", rows)
+
+
+if __name__ == "__main__":
+    main()
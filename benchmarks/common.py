@@ -0,0 +1,105 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import os
+import tempfile
+import timeit
+from contextlib import contextmanager
+from typing import Callable, Dict, Sequence, Text
+
+from pad_configuration import Configuration
+
+
+def synthetic_entries(size: int) -> Sequence[Dict]:
+    """
+    PAD entries with unique names following the structure of ``Configuration.entry_example``.
+    Versions, energies, luminosities and detector cards take a few distinct values like in the
+    actual PADs, every fifth entry has full likelihoods.
+    """
+    entries = []
+    for idx in range(size):
+        collaboration = ["atlas", "cms"][idx % 2]
+        name = f"{collaboration}_susy_{2012 + idx % 10}_{idx:06d}"
+        entry = Configuration.entry_example()[0]
+        entry.update({
+            "name": name,
+            "description": f"{collaboration.upper():<5} - {[8, 13][idx % 3 != 0]:>2} TeV - "
+                           f"synthetic analysis {idx} ({[20.3, 36.1, 139.0][idx % 3]}/fb)",
+            "padversion": ["v1.1", "v1.2", "vSFS"][idx % 3],
+            "ma5version": ["v1.6.0", "v1.8.0", "v1.9.60", "v1.10.0"][idx % 4],
+            "gcc": ["98", "11", "14"][idx % 3],
+            "bibtex": [
+                f"@article{{{name},\n    author = {{Synthetic}},\n"
+                f"    title = {{{{Synthetic analysis {idx}}}}},\n    year = {{2021}},\n"
+                f"    doi = {{10.14428/DVN/{idx:06d}}}\n}}\n"
+            ],
+        })
+        datafile = "https://dataverse.uclouvain.be/api/access/datafile/"
+        entry["url"].update({
+            "cpp": f"{datafile}{4 * idx}",
+            "header": f"{datafile}{4 * idx + 1}",
+            "info": f"{datafile}{4 * idx + 2}",
+            "json": [
+                {"name": f"SR{region}", "url": f"{datafile}{10 ** 7 + 2 * idx + region}"}
+                for region in range(2 * (idx % 5 == 0))
+            ],
+            "detector": {
+                "name": f"{collaboration}_card_{idx % 50}", "url": f"{datafile}{10 ** 8 + idx % 50}"
+            },
+        })
+        entries.append(entry)
+    return entries
+
+
+@contextmanager
+def temporary_pad(entries: Sequence[Dict], padname: Text = "PAD", format: Text = "jz"):
+    """
+    Store the given entries as the metadata of ``padname`` in a temporary directory, so that
+    benchmarks never modify the metadata shipped with the package.
+    """
+    previous = Configuration._paddata[padname]
+    with tempfile.TemporaryDirectory() as tmp:
+        Configuration._paddata[padname] = os.path.join(tmp, os.path.basename(previous))
+        try:
+            Configuration.save(padname, entries, format=format)
+            yield Configuration._paddata[padname]
+        finally:
+            Configuration._paddata[padname] = previous
+            Configuration.clear_cache()
+
+
+def measure(function: Callable, number: int = 1, repeat: int = 5) -> float:
+    """
+    Best wall time of a single call in seconds
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def report(title: Text, rows: Sequence[Sequence]) -> None:
+    """
+    Print timings as a table, rows are (label, size, seconds)
+    """
+    print(f"# {title}")
+    for label, size, seconds in rows:
+        print(f"{label:<45} {size:>8} {seconds * 1e3:>12.4f} ms")
+    print()
@@ -0,0 +1,93 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Import time of the package, measured with ``python -X importtime`` in fresh interpreters.
+Modules which are imported on first use (jsonschema, http.client, concurrent.futures) are
+imported beforehand to reproduce eager imports.
+
+    python benchmarks/importtime.py
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+from common import report
+
+_deferred = ["jsonschema", "http.client", "concurrent.futures"]
+
+
+def _environment():
+    environment = dict(os.environ)
+    environment.update({
+        "PYTHONPATH": os.pathsep.join(
+            [os.path.join(os.path.dirname(__file__), "..", "src"), environment.get("PYTHONPATH", "")]
+        )
+    })
+    return environment
+
+
+def import_time(statement: str, repeat: int = 7) -> float:
+    """
+    Best total import time of the statement in seconds, excluding the interpreter startup.
+    """
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            stderr=subprocess.PIPE, env=_environment(), check=True, universal_newlines=True,
+        ).stderr
+        # top level imports only, nested imports are included in their parents
+        total = sum(
+            int(match.group(1))
+            for match in re.finditer(r"import time:\s+\d+ \|\s+(\d+) \| (\S+)$", output, re.M)
+            if match.group(2) not in ["site", "encodings"] and not match.group(2).startswith(
+                ("encodings.", "_")
+            )
+        )
+        best = total if best is None else min(best, total)
+    return best * 1e-6
+
+
+def main():
+    eager = "import " + ", ".join(_deferred) + "; "
+    read = "import pad_configuration; pad_configuration.Configuration('PAD')"
+    rows = [
+        ("import pad_configuration", 1, import_time("import pad_configuration")),
+        ("import pad_configuration, eager imports", 1,
+         import_time(eager + "import pad_configuration")),
+        ("import pad_configuration, read PAD", 1, import_time(read)),
+    ]
+    report("Import time", rows)
+
+    loaded = subprocess.run(
+        [sys.executable, "-c", read + "; import sys; print('jsonschema' in sys.modules)"],
+        stdout=subprocess.PIPE, env=_environment(), check=True, universal_newlines=True,
+    ).stdout.strip()
+    print(f"jsonschema imported after reading: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Planning the installation of all the analyses of synthetic databases (see
+``common.synthetic_entries``) versus downloading the files of each analysis independently.
+
+    python benchmarks/install_plan.py
+"""
+
+from common import measure, report, synthetic_entries
+from pad_configuration import Configuration
+
+
+def main():
+    rows = []
+    for size in [1000, 10000]:
+        config = Configuration("PAD", [Configuration._make_entry(x) for x in synthetic_entries(size)])
+        analyses = list(config.keys())
+        rows += [
+            ("plan_install, all analyses", size,
+             measure(lambda: config.plan_install(analyses, "v1.9.60", 11), repeat=3)),
+            ("artifacts of each analysis", size,
+             measure(lambda: [config.artifacts(analysis) for analysis in analyses], repeat=3)),
+        ]
+        plan = config.plan_install(analyses, "v1.9.60", 11)
+        downloads = sum(len(urls) for urls in plan.requires.values())
+        print(
+            f"{size} entries: {plan}, {downloads} files without sharing, "
+            f"{len(plan.shared())} shared artifacts"
+        )
+    report("Install plan", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Cost of a single ``add_bibtex_info`` as a function of the database size. The reload of the
+previous implementation (validate everything, write, re-read the file) is reproduced for
+comparison up to 10⁴ entries, as well as the cost per edit of a transaction of 50 edits. Metadata files are
+rewritten by every edit, the SQLite backend only writes the modified rows.
+
+    python benchmarks/mutation.py
+"""
+
+from itertools import count
+
+import jsonschema
+
+from common import measure, report, synthetic_entries, temporary_pad
+from pad_configuration import Configuration, validation
+
+# records with an existing citation key are skipped, use a new key for each edit
+_keys = count()
+
+
+def record() -> str:
+    return f"@misc{{benchmark_{next(_keys)},}}"
+
+
+def reload_edit(config: Configuration, analysis: str) -> Configuration:
+    pad_data = config._asdict()
+    pad_data[config._index[analysis]]["bibtex"].append(record())
+    jsonschema.validate(pad_data, validation.get_schema())
+    Configuration.save(config.padname, pad_data)
+    return Configuration(config.padname)
+
+
+def transaction(config: Configuration, analysis: str, edits: int) -> None:
+    with config.transaction():
+        for _ in range(edits):
+            config.add_bibtex_info(analysis, record())
+
+
+def main():
+    rows = []
+    for size in [1000, 10000, 100000]:
+        for format in ["jz", "binary", "sqlite"]:
+            with temporary_pad(synthetic_entries(size), format=format):
+                config = Configuration("PAD")
+                analysis = config[size // 2].name
+                if format == "jz" and size <= 10000:
+                    # about 25 s per edit for 10⁵ entries
+                    rows.append(
+                        (f"{format}: validate + write + reload", size,
+                         measure(lambda: reload_edit(config, analysis), repeat=3))
+                    )
+                # the metadata has been written by another configuration
+                config = Configuration("PAD")
+                rows += [
+                    (f"{format}: in-place update", size,
+                     measure(lambda: config.add_bibtex_info(analysis, record()),
+                             repeat=3)),
+                    (f"{format}: transaction, per edit", size,
+                     measure(lambda: transaction(config, analysis, 50), repeat=3) / 50),
+                ]
+    report("Single edit", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Timings of the main code paths on synthetic databases (see ``common.synthetic_entries``):
+loading, lookups, filter, combination, recast_config, write_bibtex and modifications.
+
+    python benchmarks/suite.py --sizes 1000 10000 100000 --output results.json
+    python benchmarks/suite.py --compare results.json --tolerance 1.5
+
+With ``--compare``, the script exits with status 1 if any timing is slower than the reference
+by more than the tolerance factor.
+"""
+
+import argparse
+import io
+import json
+import sys
+from itertools import count
+from typing import Dict, List
+
+from common import measure, report, synthetic_entries, temporary_pad
+from pad_configuration import Configuration
+
+_keys = count()
+
+
+def load(rows: List, size: int, entries) -> None:
+    for padname in ["PAD", "PADForMA5tune", "PADForSFS"]:
+        with temporary_pad(entries, padname):
+            rows += [
+                (f"{padname}: cold load", size,
+                 measure(lambda: (Configuration.clear_cache(), Configuration(padname)), repeat=3)),
+                (f"{padname}: warm load", size, measure(lambda: Configuration(padname), repeat=3)),
+                (f"{padname}: warm lazy load", size,
+                 measure(lambda: Configuration(padname, lazy=True), repeat=3)),
+            ]
+
+
+def read(rows: List, size: int, config: Configuration) -> None:
+    analysis = config[size // 2].name
+    bibliography = [config[idx].name for idx in range(0, size, max(size // 100, 1))]
+
+    def first(function):
+        # cost including the construction of the derived indexes
+        def run():
+            config._invalidate()
+            return function()
+        return run
+
+    rows += [
+        ("get_analysis", size, measure(lambda: config.get_analysis(analysis), number=10000)),
+        ("in", size, measure(lambda: analysis in config, number=10000)),
+        ("filter, first call", size, measure(first(lambda: config.filter("v1.9.60", 11)))),
+        ("filter, memoised", size, measure(lambda: config.filter("v1.9.60", 11), number=1000)),
+        ("query, first call", size,
+         measure(first(lambda: config.query(collaboration="cms", sqrt_s=13, min_lumi=100)))),
+        ("query", size,
+         measure(lambda: config.query(collaboration="cms", sqrt_s=13, min_lumi=100))),
+        ("recast_config, first call", size, measure(first(config.recast_config))),
+        ("recast_config", size, measure(config.recast_config)),
+        ("write_bibtex, 100 analyses", size,
+         measure(lambda: config.write_bibtex(io.StringIO(), bibliography))),
+        ("write_bibtex, all analyses", size,
+         measure(lambda: config.write_bibtex(io.StringIO(), list(config.keys())), repeat=3)),
+    ]
+
+
+def combine(rows: List, size: int, config: Configuration) -> None:
+    parts = [
+        Configuration("PAD", config.pad_data[idx::3]) for idx in range(3)
+    ]
+    analysis = config[size // 2].name
+    chain = parts[0] + parts[1] + parts[2]
+    rows += [
+        ("__add__, 3 configurations + first lookup", size,
+         measure(lambda: (parts[0] + parts[1] + parts[2]).get_analysis(analysis))),
+        ("__add__, lookup", size, measure(lambda: chain.get_analysis(analysis), number=10000)),
+    ]
+
+
+def mutate(rows: List, size: int, entries) -> None:
+    repeat = 3 if size <= 10000 else 1
+    with temporary_pad(entries, "PAD"):
+        config = Configuration("PAD")
+        analysis = config[size // 2].name
+        new_entry = config.entry_asdict(analysis)
+
+        def add_entry():
+            entry = dict(new_entry, name=f"benchmark_{next(_keys)}")
+            Configuration.add_entry("PAD", [entry])
+
+        rows += [
+            ("update_entry", size,
+             measure(lambda: config.update_entry(analysis, new_entry), repeat=repeat)),
+            ("add_json_info", size, measure(
+                lambda: config.add_json_info(
+                    analysis, {"name": f"SR{next(_keys)}", "url": "https://localhost/sr.json"}
+                ), repeat=repeat,
+            )),
+            ("add_bibtex_info", size, measure(
+                lambda: config.add_bibtex_info(analysis, f"@misc{{benchmark_{next(_keys)},}}"),
+                repeat=repeat,
+            )),
+            ("add_entry", size, measure(add_entry, repeat=repeat)),
+        ]
+
+
+def compare(results: Dict[str, float], reference: Dict[str, float], tolerance: float) -> bool:
+    regressions = [
+        (key, reference[key], seconds) for key, seconds in results.items()
+        if key in reference and seconds > tolerance * reference[key]
+    ]
+    for key, before, after in regressions:
+        print(f"Regression: {key} {before * 1e3:.4f} ms -> {after * 1e3:.4f} ms")
+    return len(regressions) == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PAD configuration benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--output", help="write the timings in a JSON file")
+    parser.add_argument("--compare", help="JSON file of reference timings")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args()
+
+    rows = {"Load": [], "Read": [], "Combine": [], "Modify": []}
+    for size in args.sizes:
+        entries = synthetic_entries(size)
+        load(rows["Load"], size, entries)
+        config = Configuration("PAD", [Configuration._make_entry(x) for x in entries])
+        read(rows["Read"], size, config)
+        combine(rows["Combine"], size, config)
+        mutate(rows["Modify"], size, entries)
+
+    for title, timings in rows.items():
+        report(title, timings)
+
+    results = {
+        f"{label} [{size}]": seconds
+        for timings in rows.values() for label, size, seconds in timings
+    }
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+    if args.compare is not None:
+        with open(args.compare, "r") as f:
+            reference = json.load(f)
+        if not compare(results, reference, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
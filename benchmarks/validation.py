@@ -0,0 +1,58 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Validation cost of a single edit: ``jsonschema.validate`` on the full database (previous
+behaviour) versus the cached validator and the compiled schema on the modified entry.
+
+    python benchmarks/validation.py
+"""
+
+import jsonschema
+
+from common import measure, report, synthetic_entries
+from pad_configuration import validation
+
+
+def main():
+    schema = validation.get_schema()
+    rows = []
+    for size in [10, 100, 1000]:
+        entries = synthetic_entries(size)
+        rows += [
+            ("jsonschema.validate, full database", size,
+             measure(lambda: jsonschema.validate(entries, schema))),
+            ("cached validator, full database", size,
+             measure(lambda: validation.validate(entries, fast=False))),
+            ("compiled schema, full database", size,
+             measure(lambda: validation.validate(entries))),
+            ("cached validator, modified entry", size,
+             measure(lambda: validation.validate(entries[:1], fast=False), number=100)),
+            ("compiled schema, modified entry", size,
+             measure(lambda: validation.validate(entries[:1]), number=100)),
+        ]
+    report("Validation", rows)
+
+
+if __name__ == "__main__":
+    main()
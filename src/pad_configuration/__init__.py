@@ -1,5 +1,6 @@
-from .configuration import Configuration
+from .cache import ArtifactCache
+from .configuration import Configuration, ChainedConfiguration, ConflictError
 
-__all__ = ["Configuration"]
+__all__ = ["Configuration", "ChainedConfiguration", "ArtifactCache", "ConflictError"]
 
 __version__ = "0.0.1"
\ No newline at end of file
@@ -0,0 +1,462 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Storage backends for PAD metadata kept in databases which are updated in place, as opposed to
+the metadata files (``.json``, ``.jz``, ``.jzb``) which are rewritten by every modification.
+Backends are selected by ``Configuration`` from the format of the metadata file, see
+``Configuration.register_backend``.
+"""
+
+import json
+import os
+import threading
+from collections import namedtuple
+from collections.abc import Sequence as SequenceABC
+from typing import Dict, List, Optional, Sequence, Text, Tuple
+
+from .utils import cpp_standard_key, parse_description, version_key
+
+# Attributes of an entry used by Configuration.filter and Configuration.query
+Attributes = namedtuple(
+    "Attributes", ["collaboration", "padversion", "ma5version_key", "gcc_key", "sqrt_s", "lumi"]
+)
+
+
+class ConflictError(RuntimeError):
+    """
+    Metadata file has been modified by another configuration or process since the
+    configuration has been loaded.
+    """
+
+
+def _key(function, version) -> Optional[int]:
+    try:
+        return function(version)
+    except (AssertionError, ValueError):
+        return None
+
+
+def attributes(entry: Dict) -> Attributes:
+    """
+    Returns
+    -------
+    Attributes
+        collaboration (from the analysis name), PAD version, MadAnalysis 5 and C++ version
+        keys (see ``utils.version_key`` and ``utils.cpp_standard_key``, None if the version
+        can not be parsed), centre-of-mass energy and integrated luminosity (from the
+        description).
+    """
+    sqrt_s, lumi = parse_description(entry["description"])
+    return Attributes(
+        # analysis names start with the collaboration e.g. atlas_susy_2018_31
+        entry["name"].split("_", 1)[0].lower(),
+        entry["padversion"],
+        _key(version_key, entry["ma5version"]),
+        _key(cpp_standard_key, entry["gcc"]),
+        sqrt_s,
+        lumi,
+    )
+
+
+class StorageBackend:
+    """
+    Interface of the metadata storage backends. A backend stores the entries of a PAD in a
+    single file and keeps a revision number which changes with every write.
+
+    Parameters
+    ----------
+    filename : Text
+        database file, created on first write if it does not exist.
+    """
+
+    def __init__(self, filename: Text):
+        self.filename = filename
+
+
+    @staticmethod
+    def detect(filename: Text) -> bool:
+        """
+        Returns
+        -------
+        bool
+            True if the file has been written by this backend
+        """
+        raise NotImplementedError
+
+
+    def revision(self) -> int:
+        """
+        Returns
+        -------
+        int
+            revision of the stored metadata, incremented by every write.
+        """
+        raise NotImplementedError
+
+
+    def snapshot(self) -> "Snapshot":
+        """
+        Returns
+        -------
+        Snapshot
+            view of the stored entries at the current revision
+        """
+        raise NotImplementedError
+
+
+    def write(self, entries: Sequence[Dict]) -> None:
+        """Replace all the stored entries."""
+        raise NotImplementedError
+
+
+    def update(self, changes: Dict[int, Dict], size: int) -> None:
+        """
+        Replace or add entries in a single transaction.
+
+        Parameters
+        ----------
+        changes : Dict[int, Dict]
+            new entries keyed by their position
+        size : int
+            number of entries after the update, entries beyond are removed.
+        """
+        raise NotImplementedError
+
+
+    def remove(self) -> None:
+        """Delete the database, e.g. when the metadata is written in another format."""
+        os.remove(self.filename)
+
+
+_insert = "INSERT INTO entries VALUES (?,?,?,?,?,?,?,?,?,?,?,?)"
+
+
+def _sqlite3():
+    """
+    sqlite3 is imported when a database is used, reading other formats does not require it.
+    """
+    import sqlite3
+    return sqlite3
+
+
+class Snapshot(SequenceABC):
+    """
+    Entries of a storage backend at a given revision, decoded on access.
+
+    Attributes
+    ----------
+    names : List[Text]
+        analysis names in the order of the entries
+    revision : int
+        revision of the stored metadata
+    attributes : Optional[List[Attributes]]
+        attributes of the entries, None if the backend does not store them.
+    """
+
+    attributes = None
+
+
+    def close(self) -> None:
+        """Release the resources of the snapshot, they are acquired again on access."""
+
+
+class SQLiteSnapshot(Snapshot):
+    """
+    Entries of a SQLite database at the revision the snapshot has been taken. Names and
+    attributes are read when the snapshot is taken, entries are read on access in short read
+    transactions so that the snapshot never prevents WAL checkpoints.
+
+    Raises
+    ------
+    ConflictError
+        on access, if the entry has been modified since the snapshot has been taken.
+    """
+
+    def __init__(self, filename: Text):
+        self.filename = filename
+        self._connection = None
+        self._lock = threading.Lock()
+        self._positions, self.names, self.attributes = [], [], []
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN")
+            try:
+                self.revision = connection.execute("PRAGMA user_version").fetchone()[0]
+                for row in connection.execute(
+                    "SELECT position, name, collaboration, padversion, ma5version_key, gcc_key, "
+                    "sqrt_s, lumi FROM entries ORDER BY position"
+                ):
+                    self._positions.append(row[0])
+                    self.names.append(row[1])
+                    self.attributes.append(Attributes(*row[2:]))
+            finally:
+                connection.execute("COMMIT")
+
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = SQLiteBackend.connect(self.filename)
+        return self._connection
+
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+
+    def __getitem__(self, idx: int) -> Dict:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT name, revision, data FROM entries WHERE position = ?",
+                (self._positions[idx],),
+            ).fetchone()
+        if row is None or row[0] != self.names[idx] or row[1] > self.revision:
+            raise ConflictError(
+                f"{self.names[idx]} has been modified since the metadata has been loaded. "
+                f"Please create a new configuration."
+            )
+        return json.loads(row[2])
+
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    PAD metadata in a SQLite database. Every entry is a row holding its JSON and the columns
+    used for selections: name, collaboration, PAD version, MadAnalysis 5 version and C++
+    standard, which are indexed, as well as centre-of-mass energy and luminosity. The
+    database is in WAL mode: readers do not block writers and vice versa, and single entries
+    are updated in a transaction without rewriting the database.
+
+    .. code-block:: python
+
+        Configuration.save("PAD", Configuration("PAD")._asdict(), format = "sqlite")
+        SQLiteBackend(Configuration._paddata["PAD"].replace(".json", ".sqlite")).select(
+            collaboration = "cms", ma5version = "v1.9.60"
+        )
+    """
+
+    _magic = b"SQLite format 3\x00"
+
+    _schema = [
+        "CREATE TABLE IF NOT EXISTS entries ("
+        "position INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, "
+        "collaboration TEXT NOT NULL, padversion TEXT NOT NULL, "
+        "ma5version TEXT NOT NULL, ma5version_key INTEGER, "
+        "gcc TEXT NOT NULL, gcc_key INTEGER, "
+        "sqrt_s REAL, lumi REAL, revision INTEGER NOT NULL, data TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS entries_collaboration ON entries (collaboration)",
+        "CREATE INDEX IF NOT EXISTS entries_padversion ON entries (padversion)",
+        "CREATE INDEX IF NOT EXISTS entries_ma5version ON entries (ma5version_key)",
+        "CREATE INDEX IF NOT EXISTS entries_gcc ON entries (gcc_key)",
+    ]
+
+
+    @staticmethod
+    def connect(filename: Text, create: bool = False):
+        """
+        Parameters
+        ----------
+        filename : Text
+            database file
+        create : bool
+            create the database, its tables and indexes if they do not exist.
+
+        Returns
+        -------
+        sqlite3.Connection
+            connection in autocommit mode, transactions are explicit.
+        """
+        connection = _sqlite3().connect(
+            filename, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        if create:
+            if connection.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+                connection.execute("PRAGMA journal_mode=WAL")
+            for statement in SQLiteBackend._schema:
+                connection.execute(statement)
+        return connection
+
+
+    @staticmethod
+    def detect(filename: Text) -> bool:
+        with open(filename, "rb") as f:
+            return f.read(len(SQLiteBackend._magic)) == SQLiteBackend._magic
+
+
+    def revision(self) -> int:
+        connection = SQLiteBackend.connect(self.filename)
+        try:
+            return connection.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            connection.close()
+
+
+    def snapshot(self) -> SQLiteSnapshot:
+        return SQLiteSnapshot(self.filename)
+
+
+    @staticmethod
+    def _row(position: int, entry: Dict, revision: int) -> Tuple:
+        attrs = attributes(entry)
+        return (
+            position, entry["name"], attrs.collaboration, attrs.padversion,
+            entry["ma5version"], attrs.ma5version_key, str(entry["gcc"]), attrs.gcc_key,
+            attrs.sqrt_s, attrs.lumi, revision, json.dumps(entry),
+        )
+
+
+    def _transaction(self, statements) -> None:
+        """
+        Execute ``statements(connection, revision)`` in a write transaction, rows written
+        by the statements are marked with the new revision.
+        """
+        connection = SQLiteBackend.connect(self.filename, create=True)
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                revision = connection.execute("PRAGMA user_version").fetchone()[0] + 1
+                statements(connection, revision)
+                connection.execute(f"PRAGMA user_version = {int(revision)}")
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        finally:
+            connection.close()
+
+
+    def write(self, entries: Sequence[Dict]) -> None:
+        def statements(connection, revision):
+            rows = [
+                SQLiteBackend._row(position, entry, revision)
+                for position, entry in enumerate(entries)
+            ]
+            connection.execute("DELETE FROM entries")
+            connection.executemany(_insert, rows)
+
+        self._transaction(statements)
+
+
+    def update(self, changes: Dict[int, Dict], size: int) -> None:
+        def statements(connection, revision):
+            rows = [
+                SQLiteBackend._row(position, entry, revision)
+                for position, entry in changes.items()
+            ]
+            connection.execute("DELETE FROM entries WHERE position >= ?", (size,))
+            connection.executemany(
+                "DELETE FROM entries WHERE position = ?", [(x,) for x in changes]
+            )
+            connection.executemany(_insert, rows)
+
+        self._transaction(statements)
+
+
+    def remove(self) -> None:
+        # a new database with the same name would replay a remaining write-ahead log
+        for filename in [self.filename + "-wal", self.filename + "-shm", self.filename]:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+
+    def get(self, name: Text) -> Optional[Dict]:
+        """
+        Parameters
+        ----------
+        name : Text
+            analysis name
+
+        Returns
+        -------
+        Optional[Dict]
+            current entry, None if the analysis does not exist.
+        """
+        connection = SQLiteBackend.connect(self.filename)
+        try:
+            row = connection.execute("SELECT data FROM entries WHERE name = ?", (name,)).fetchone()
+        finally:
+            connection.close()
+        return json.loads(row[0]) if row is not None else None
+
+
+    def select(
+            self,
+            collaboration: Optional[Text] = None,
+            padversion: Optional[Text] = None,
+            ma5version: Optional[Text] = None,
+            gcc: Optional[Text] = None,
+            sqrt_s: Optional[float] = None,
+            min_lumi: Optional[float] = None,
+    ) -> List[Text]:
+        """
+        Select analyses with the indexes of the database, without decoding any entry.
+        Criteria which are None are ignored.
+
+        Parameters
+        ----------
+        collaboration : Optional[Text]
+            collaboration name e.g. "atlas" or "cms"
+        padversion : Optional[Text]
+            PAD version e.g. "vSFS"
+        ma5version : Optional[Text]
+            local MadAnalysis 5 version, analyses requiring a newer version are not selected.
+        gcc : Optional[Text]
+            local C++ standard, analyses requiring a newer standard are not selected.
+        sqrt_s : Optional[float]
+            centre-of-mass energy in TeV
+        min_lumi : Optional[float]
+            minimum integrated luminosity in fb^-1
+
+        Returns
+        -------
+        List[Text]
+            names of the selected analyses, in the order of the entries.
+        """
+        conditions, parameters = [], []
+        for condition, value in [
+            ("collaboration = ?", collaboration.lower() if collaboration is not None else None),
+            ("padversion = ?", padversion),
+            ("ma5version_key <= ?", version_key(ma5version) if ma5version is not None else None),
+            ("gcc_key <= ?", cpp_standard_key(gcc) if gcc is not None else None),
+            ("sqrt_s = ?", float(sqrt_s) if sqrt_s is not None else None),
+            ("lumi >= ?", min_lumi),
+        ]:
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+
+        statement = "SELECT name FROM entries"
+        if conditions:
+            statement += " WHERE " + " AND ".join(conditions)
+        connection = SQLiteBackend.connect(self.filename)
+        try:
+            rows = connection.execute(statement + " ORDER BY position", parameters)
+            return [row[0] for row in rows]
+        finally:
+            connection.close()
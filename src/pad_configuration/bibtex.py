@@ -0,0 +1,389 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Text, TextIO, Tuple
+
+from .cache import ArtifactCache
+from .utils import atomic_write
+
+common_bibliography_file = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "meta", "common_bibliography.bib"
+)
+# parsed records, keyed by the hash of their text. If None, ``bibtex_cache.json`` in the user
+# cache directory, see ``cache.ArtifactCache.default_root``
+record_cache_file = None
+
+BibRecord = namedtuple("BibRecord", ["key", "type", "fields", "text"])
+
+ANALYSES_HEADER = "\n\n\n\n%%%%%%%%%%%%%%%%%%%\n%    Analyses    %%\n%%%%%%%%%%%%%%%%%%%\n\n\n"
+
+_key_pattern = re.compile(r"@\s*(\w+)\s*[{(]\s*([^,\s]+)\s*,")
+_start_pattern = re.compile(r"@\s*(\w+)\s*([{(])")
+_field_pattern = re.compile(r"[\s,]*([\w\-:.]+)\s*=\s*")
+_lock = threading.Lock()
+# {(filename, mtime, size) : (text, citation keys)}
+_common_cache = {}
+# {record hash : [key, type, fields]}, see _record_cache
+_records = None
+# hashes of the records parsed or looked up by the current process, least recent first
+_used = {}
+
+
+def citation_key(record: Text) -> Optional[Text]:
+    """
+    Parameters
+    ----------
+    record : Text
+        BibTeX record e.g. ``@article{Conte:2012fm, ...}``
+
+    Returns
+    -------
+    Optional[Text]
+        citation key of the record, None if it can not be found.
+    """
+    match = _key_pattern.search(record)
+    return match.group(2) if match is not None else None
+
+
+def citation_keys(text: Text) -> Set[Text]:
+    """
+    Returns
+    -------
+    Set[Text]
+        citation keys of all the records in the text
+    """
+    return {match.group(2) for match in _key_pattern.finditer(text)}
+
+
+def common_bibliography() -> Tuple[Text, Set[Text]]:
+    """
+    Content of ``meta/common_bibliography.bib``, read once and kept until the file changes.
+
+    Returns
+    -------
+    Tuple[Text, Set[Text]]
+        text of the file and citation keys defined in it
+    """
+    stat = os.stat(common_bibliography_file)
+    key = (common_bibliography_file, stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _common_cache.get(key, None)
+    if cached is None:
+        with open(common_bibliography_file, "r") as f:
+            text = f.read()
+        cached = (text, citation_keys(text))
+        with _lock:
+            _common_cache.clear()
+            _common_cache[key] = cached
+    return cached
+
+
+def write_bibliography(stream: TextIO, records: Iterable[Text]) -> Set[Text]:
+    """
+    Write the common bibliography followed by the given records. Records whose citation key
+    has already been written are skipped.
+
+    Parameters
+    ----------
+    stream : TextIO
+        output stream
+    records : Iterable[Text]
+        BibTeX records of the analyses
+
+    Returns
+    -------
+    Set[Text]
+        citation keys written to the stream
+    """
+    text, keys = common_bibliography()
+    written = set(keys)
+    stream.write(text)
+    stream.write(ANALYSES_HEADER)
+    for record in records:
+        key = citation_key(record)
+        if key is not None:
+            if key in written:
+                continue
+            written.add(key)
+        stream.write(record)
+        stream.write("\n\n\n")
+    return written
+
+
+def _closing(text: Text, position: int) -> int:
+    """
+    Position after the brace closing the one at ``position``. Returns the length of the text
+    if the braces are not balanced.
+    """
+    depth = 0
+    for idx in range(position, len(text)):
+        if text[idx] == "{":
+            depth += 1
+        elif text[idx] == "}":
+            depth -= 1
+            if depth == 0:
+                return idx + 1
+    return len(text)
+
+
+def _read_value(body: Text, position: int) -> Tuple[Text, int]:
+    """
+    Read a field value starting at ``position``, returns the value and the position after it.
+    """
+    if position >= len(body):
+        return "", position
+    if body[position] == "{":
+        end = _closing(body, position)
+        return body[position + 1:end - 1].strip(), end
+    if body[position] == '"':
+        depth, idx = 0, position + 1
+        while idx < len(body):
+            char = body[idx]
+            if char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+            elif char == '"' and depth == 0 and body[idx - 1] != "\\":
+                return body[position + 1:idx].strip(), idx + 1
+            idx += 1
+        return body[position + 1:].strip(), len(body)
+    match = re.match(r"[^,}\s]*", body[position:])
+    return match.group(0), position + match.end()
+
+
+def parse_record(text: Text) -> Optional[BibRecord]:
+    """
+    Parse a single BibTeX record
+
+    Parameters
+    ----------
+    text : Text
+        BibTeX record e.g. ``@article{Conte:2012fm, author = "...", ...}``
+
+    Returns
+    -------
+    Optional[BibRecord]
+        parsed record with lower case type and field names, None if the text is not a record.
+    """
+    match = _key_pattern.search(text)
+    if match is None:
+        return None
+
+    body, position, fields = text[match.end():], 0, {}
+    while True:
+        field = _field_pattern.match(body, position)
+        if field is None:
+            break
+        value, position = _read_value(body, field.end())
+        fields.update({field.group(1).lower(): value})
+
+    return BibRecord(match.group(2), match.group(1).lower(), fields, text)
+
+
+def split_records(text: Text) -> List[Text]:
+    """
+    Split a BibTeX file into its records, comments between records are dropped.
+    """
+    records, position = [], 0
+    while True:
+        match = _start_pattern.search(text, position)
+        if match is None:
+            return records
+        if match.group(2) == "{":
+            end = _closing(text, match.end() - 1)
+        else:
+            end = text.find(")", match.end())
+            end = len(text) if end < 0 else end + 1
+        records.append(text[match.start():end])
+        position = end
+
+
+def _record_cache_file() -> Text:
+    if record_cache_file is not None:
+        return record_cache_file
+    return os.path.join(ArtifactCache.default_root(), "bibtex_cache.json")
+
+
+def _record_cache() -> Dict[Text, Sequence]:
+    global _records
+    if _records is None:
+        records = {}
+        filename = _record_cache_file()
+        if os.path.isfile(filename):
+            try:
+                with open(filename, "r") as f:
+                    records = json.load(f)
+            except (OSError, ValueError):
+                records = {}
+        _records = records
+    return _records
+
+
+def _pruned_record_cache() -> Dict[Text, Sequence]:
+    """
+    Records to be stored. Only the most recently used text of each citation key is kept if
+    the key has been used by the current process, previous versions of modified records are
+    dropped. Unused texts which are not BibTeX records are dropped as well.
+    """
+    latest = {_records[digest][0]: digest for digest in _used if _records[digest] is not None}
+    return {
+        digest: record for digest, record in _records.items()
+        if (record is None and digest in _used)
+        or (record is not None and latest.get(record[0], digest) == digest)
+    }
+
+
+def parse_cached(records: Iterable[Text]) -> List[BibRecord]:
+    """
+    Parse BibTeX records. Parsed records are stored in ``bibtex_cache.json`` in the user cache
+    directory, see ``record_cache_file``, and the file is updated if new records have been
+    parsed. If the file can not be written, parsed records are only kept for the current
+    process.
+
+    Parameters
+    ----------
+    records : Iterable[Text]
+        BibTeX records
+
+    Returns
+    -------
+    List[BibRecord]
+        parsed records, texts which are not BibTeX records are skipped.
+    """
+    with _lock:
+        cache = _record_cache()
+        parsed, modified = [], False
+        for text in records:
+            digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+            if digest not in cache:
+                record = parse_record(text)
+                cache[digest] = None if record is None else [record.key, record.type, record.fields]
+                modified = True
+            _used.pop(digest, None)
+            _used[digest] = None
+            if cache[digest] is not None:
+                parsed.append(BibRecord(*cache[digest], text))
+        content = json.dumps(_pruned_record_cache()) if modified else None
+
+    if content is not None:
+        filename = _record_cache_file()
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            atomic_write(filename, content, durable=False)
+        except OSError:
+            # read-only location, records are only kept for the current process
+            pass
+    return parsed
+
+
+class BibliographyIndex:
+    """
+    Index of the BibTeX records of a set of analyses and of the common bibliography.
+
+    Parameters
+    ----------
+    entries : Iterable
+        PAD entries, only ``name`` and ``bibtex`` attributes are used.
+    """
+
+    def __init__(self, entries: Iterable):
+        self.records = {}
+        self._analyses = {}
+        self._dois = {}
+
+        common, _ = common_bibliography()
+        for record in parse_cached(split_records(common)):
+            self._add(record, None)
+        for entry in entries:
+            for record in parse_cached(entry.bibtex):
+                self._add(record, entry.name)
+
+
+    def _add(self, record: BibRecord, analysis: Optional[Text]) -> None:
+        self.records.setdefault(record.key, record)
+        analyses = self._analyses.setdefault(record.key, [])
+        if analysis is not None and analysis not in analyses:
+            analyses.append(analysis)
+        doi = record.fields.get("doi", None)
+        if doi is not None:
+            self._dois.setdefault(doi.lower(), set()).add(record.key)
+
+
+    def get_citation(self, key: Text) -> Optional[BibRecord]:
+        """
+        Parameters
+        ----------
+        key : Text
+            citation key
+
+        Returns
+        -------
+        Optional[BibRecord]
+            record with the given citation key, None if it does not exist.
+        """
+        return self.records.get(key, None)
+
+
+    def analyses_of(self, key: Text) -> List[Text]:
+        """
+        Returns
+        -------
+        List[Text]
+            analyses citing the record with the given key. Records of the common bibliography
+            are not attached to any analysis.
+        """
+        return list(self._analyses.get(key, []))
+
+
+    def keys_of_doi(self, doi: Text) -> Set[Text]:
+        """
+        Returns
+        -------
+        Set[Text]
+            citation keys of the records with the given DOI
+        """
+        return set(self._dois.get(doi.lower(), set()))
+
+
+    def analyses_citing(self, doi: Text) -> List[Text]:
+        """
+        Parameters
+        ----------
+        doi : Text
+            DOI e.g. "10.14428/DVN/P82DKS", case insensitive
+
+        Returns
+        -------
+        List[Text]
+            analyses with a record of the given DOI
+        """
+        analyses = []
+        for key in self._dois.get(doi.lower(), set()):
+            analyses += [x for x in self._analyses[key] if x not in analyses]
+        return analyses
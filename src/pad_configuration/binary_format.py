@@ -0,0 +1,234 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Binary PAD metadata format. Layout of a file (little endian):
+
+.. code-block:: text
+
+    magic         8 bytes    b"\\x89MA5PAD\\n\\x1a"
+    version       uint16
+    codec length  uint16
+    entries       uint32
+    codec         codec length bytes, name of the compression codec (ascii)
+    index         for every entry:
+                      name length  uint16
+                      name         name length bytes (utf-8)
+                      offset       uint64, position of the frame from the start of the file
+                      length       uint32, size of the frame
+    frames        compressed JSON of every entry
+
+The index is not compressed, hence names and positions of the entries are available without
+decompressing any frame.
+"""
+
+import json
+import mmap
+import struct
+from collections.abc import Sequence as SequenceABC
+from typing import Dict, List, Optional, Sequence, Text, Tuple
+
+from .utils import get_codec
+
+MAGIC = b"\x89MA5PAD\n\x1a"
+VERSION = 1
+
+_header = struct.Struct("<HHI")
+_name_length = struct.Struct("<H")
+_position = struct.Struct("<QI")
+
+
+def is_binary(filename: Text) -> bool:
+    """
+    Parameters
+    ----------
+    filename : Text
+        metadata file
+
+    Returns
+    -------
+    bool
+        True if the file is written in binary metadata format
+    """
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def dumps(entries: Sequence[Dict], codec: Text = "zlib") -> bytes:
+    """
+    Encode PAD metadata in binary format
+
+    Parameters
+    ----------
+    entries : Sequence[Dict]
+        PAD metadata
+    codec : Text
+        name of the compression codec
+
+    Returns
+    -------
+    bytes
+    """
+    compress, _ = get_codec(codec)
+    codec_name = codec.encode("ascii")
+    names = [entry["name"].encode("utf-8") for entry in entries]
+    frames = [compress(json.dumps(entry).encode("utf-8")) for entry in entries]
+
+    offset = len(MAGIC) + _header.size + len(codec_name) + sum(
+        _name_length.size + len(name) + _position.size for name in names
+    )
+    index = []
+    for name, frame in zip(names, frames):
+        index += [_name_length.pack(len(name)), name, _position.pack(offset, len(frame))]
+        offset += len(frame)
+
+    return b"".join(
+        [MAGIC, _header.pack(VERSION, len(codec_name), len(entries)), codec_name] + index + frames
+    )
+
+
+def read_index(buffer) -> Tuple[Text, List[Text], List[Tuple[int, int]]]:
+    """
+    Read the header and the index of binary metadata
+
+    Parameters
+    ----------
+    buffer : bytes-like
+        content of the binary metadata file
+
+    Returns
+    -------
+    Tuple[Text, List[Text], List[Tuple[int, int]]]
+        codec name, analysis names and (offset, length) of the frames
+
+    Raises
+    ------
+    AssertionError
+        Unknown format or version
+    """
+    assert buffer[:len(MAGIC)] == MAGIC, "Unknown metadata format."
+    position = len(MAGIC)
+    version, codec_length, nentries = _header.unpack_from(buffer, position)
+    assert version == VERSION, f"Unsupported binary metadata version: {version}"
+    position += _header.size
+    codec = bytes(buffer[position:position + codec_length]).decode("ascii")
+    position += codec_length
+
+    names, frames = [], []
+    for _ in range(nentries):
+        (length,) = _name_length.unpack_from(buffer, position)
+        position += _name_length.size
+        names.append(bytes(buffer[position:position + length]).decode("utf-8"))
+        position += length
+        frames.append(_position.unpack_from(buffer, position))
+        position += _position.size
+
+    return codec, names, frames
+
+
+def loads(buffer) -> List[Dict]:
+    """
+    Decode PAD metadata written in binary format
+
+    Parameters
+    ----------
+    buffer : bytes-like
+        content of the binary metadata file
+
+    Returns
+    -------
+    List[Dict]
+        PAD metadata
+    """
+    codec, _, frames = read_index(buffer)
+    _, decompress = get_codec(codec)
+    return [
+        json.loads(decompress(bytes(buffer[offset:offset + length])))
+        for offset, length in frames
+    ]
+
+
+class BinaryMetadata(SequenceABC):
+    """
+    Random access to the entries of a binary metadata file. The file is memory mapped and
+    only the frames of the requested entries are decompressed.
+
+    Parameters
+    ----------
+    filename : Text
+        binary metadata file
+
+    Raises
+    ------
+    AssertionError
+        Unknown format or version
+    """
+
+    def __init__(self, filename: Text):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.codec, self.names, self._frames = read_index(self._buffer)
+        _, self._decompress = get_codec(self.codec)
+        self._index = {}
+        for idx, name in enumerate(self.names):
+            self._index.setdefault(name, idx)
+
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+    def __getitem__(self, idx: int) -> Dict:
+        offset, length = self._frames[idx]
+        return json.loads(self._decompress(self._buffer[offset:offset + length]))
+
+
+    def __iter__(self):
+        # frames are stored consecutively, read them in file order
+        for offset, length in self._frames:
+            yield json.loads(self._decompress(self._buffer[offset:offset + length]))
+
+
+    def __contains__(self, name: Text) -> bool:
+        return name in self._index
+
+
+    def get(self, name: Text) -> Optional[Dict]:
+        """
+        Parameters
+        ----------
+        name : Text
+            analysis name
+
+        Returns
+        -------
+        Optional[Dict]
+            decoded entry, None if the analysis does not exist.
+        """
+        idx = self._index.get(name, None)
+        return self[idx] if idx is not None else None
+
+
+    def close(self) -> None:
+        self._buffer.close()
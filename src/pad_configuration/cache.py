@@ -0,0 +1,171 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterable, Optional, Text
+
+from .fetch import ContentStore, place
+from .utils import file_lock
+
+
+class ArtifactCache(ContentStore):
+    """
+    Content addressed cache of downloaded files shared by several processes, e.g. by the jobs
+    of a cluster node. Files are keyed by URL and by the sha256 of their content. When the
+    cache exceeds its size limit, least recently used files are removed; the modification
+    time of a file is updated each time it is used.
+
+    Processes synchronise through file locks: a URL is downloaded by a single process at a
+    time, and files are not removed while they are being copied out of the cache. Files are
+    copied out of the cache rather than hard linked, hence modifying them does not affect the
+    cache or the other users.
+
+    Parameters
+    ----------
+    root : Optional[Text]
+        cache directory. Default is ``$PAD_CACHE_DIR``, otherwise
+        ``$XDG_CACHE_HOME/pad_configuration`` or ``~/.cache/pad_configuration``.
+    max_size : Optional[int]
+        maximum size of the cache in bytes, no limit if None. Default 2 GiB.
+    """
+
+    def __init__(self, root: Optional[Text] = None, max_size: Optional[int] = 2 ** 31):
+        assert max_size is None or max_size >= 0, "Invalid cache size."
+        super().__init__(root if root is not None else ArtifactCache.default_root())
+        self.max_size = max_size
+        self._lock_file = os.path.join(self.root, ".lock")
+
+
+    @staticmethod
+    def default_root() -> Text:
+        """
+        Returns
+        -------
+        Text
+            default cache directory
+        """
+        if os.environ.get("PAD_CACHE_DIR", ""):
+            return os.environ["PAD_CACHE_DIR"]
+        cache_home = os.environ.get("XDG_CACHE_HOME", "") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        return os.path.join(cache_home, "pad_configuration")
+
+
+    def lookup(self, url: Text) -> Optional[Text]:
+        """
+        Parameters
+        ----------
+        url : Text
+            file URL
+
+        Returns
+        -------
+        Optional[Text]
+            location of the cached content of the URL, None if it is not in the cache.
+        """
+        path = super().lookup(url)
+        if path is not None:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                return None
+        return path
+
+
+    def add(self, url: Text, filename: Text) -> Text:
+        with file_lock(self._lock_file, shared=True):
+            return super().add(url, filename)
+
+
+    @contextmanager
+    def lock(self, url: Text):
+        with file_lock(self.partial_path(url) + ".lock"):
+            yield
+
+
+    def checkout(self, path: Text, target: Text) -> None:
+        with file_lock(self._lock_file, shared=True):
+            place(path, target, link=False)
+
+
+    def size(self) -> int:
+        """
+        Returns
+        -------
+        int
+            total size of the cached files in bytes
+        """
+        return sum(size for _, _, size in self._objects())
+
+
+    def _objects(self):
+        objects = os.path.join(self.root, "objects")
+        for prefix in os.scandir(objects):
+            if not prefix.is_dir():
+                continue
+            for item in os.scandir(prefix.path):
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                yield item.path, stat.st_mtime, stat.st_size
+
+
+    def trim(self, keep: Iterable[Text] = ()) -> None:
+        """
+        Remove least recently used files until the cache fits in ``max_size``.
+
+        Parameters
+        ----------
+        keep : Iterable[Text]
+            files which are not removed, even if the cache stays larger than ``max_size``.
+        """
+        if self.max_size is None:
+            return
+        keep = {os.path.abspath(x) for x in keep}
+        with file_lock(self._lock_file):
+            objects = sorted(self._objects(), key=lambda x: x[1])
+            total = sum(x[2] for x in objects)
+            for path, _, size in objects:
+                if total <= self.max_size:
+                    break
+                if path in keep:
+                    continue
+                os.remove(path)
+                total -= size
+
+            # interrupted downloads which have not been resumed for a day
+            for item in os.scandir(os.path.join(self.root, "partial")):
+                if item.name.endswith(".part") and \
+                        item.stat().st_mtime < time.time() - 86400:
+                    os.remove(item.path)
+
+
+    def clear(self) -> None:
+        """Remove all the cached files."""
+        with file_lock(self._lock_file):
+            for path, _, _ in list(self._objects()):
+                os.remove(path)
@@ -0,0 +1,274 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Sequence, Text, Tuple
+
+from .entries import ReadOnlyDict
+
+
+class StringTable:
+    """
+    Dictionary encoding of repeated strings. Each distinct string is stored once and
+    represented by its code.
+    """
+
+    def __init__(self):
+        self._values = []
+        self._codes = {}
+        self._lock = threading.Lock()
+
+
+    def encode(self, value: Text) -> int:
+        code = self._codes.get(value, None)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value, None)
+                if code is None:
+                    code = len(self._values)
+                    self._values.append(sys.intern(value))
+                    self._codes[value] = code
+        return code
+
+
+    def decode(self, code: int) -> Text:
+        return self._values[code]
+
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+# Shared by all compact entries of the process
+categories = StringTable()
+prefixes = StringTable()
+
+
+def _encode_url(url: Text) -> Tuple[int, Text]:
+    """Split a URL into the code of its prefix, up to the last "/", and the remainder."""
+    prefix, separator, suffix = url.rpartition("/")
+    return prefixes.encode(prefix + separator), suffix
+
+
+def _decode_url(code: int, suffix: Text) -> Text:
+    return prefixes.decode(code) + suffix
+
+
+def _encode_item(item: Dict) -> Tuple:
+    """Encode a ``{"name": ..., "url": ...}`` item, additional keys are kept as they are."""
+    extra = {key: value for key, value in item.items() if key not in ["name", "url"]}
+    return (categories.encode(item["name"]),) + _encode_url(item["url"]) + (extra or None,)
+
+
+def _decode_item(encoded: Tuple) -> ReadOnlyDict:
+    name, code, suffix, extra = encoded
+    return ReadOnlyDict(
+        name=categories.decode(name), url=_decode_url(code, suffix), **(extra or {})
+    )
+
+
+# Attributes of the records are only set by their constructors
+_set = object.__setattr__
+
+
+class _Record:
+    """
+    Common interface of the compact records, mimicking ``collections.namedtuple``. Records
+    are shared between configurations, their attributes can not be reassigned once they
+    have been initialised.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    __hash__ = None
+
+
+    def __setattr__(self, name: Text, value) -> None:
+        raise AttributeError(f"{self._name} attributes are read-only")
+
+
+    def __delattr__(self, name: Text) -> None:
+        raise AttributeError(f"{self._name} attributes are read-only")
+
+
+    def __iter__(self):
+        return (getattr(self, field) for field in self._fields)
+
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+
+    def __getitem__(self, idx):
+        return tuple(self)[idx]
+
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (tuple, _Record)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+
+    def __repr__(self) -> Text:
+        return f"{self._name}(" + ", ".join(
+            f"{field}={getattr(self, field)!r}" for field in self._fields
+        ) + ")"
+
+
+    def __reduce__(self):
+        return self.__class__._make, (tuple(self),)
+
+
+    @classmethod
+    def _make(cls, iterable):
+        return cls(*iterable)
+
+
+    def _asdict(self) -> Dict:
+        return OrderedDict((field, getattr(self, field)) for field in self._fields)
+
+
+    def _replace(self, **kwargs):
+        return self.__class__(**{**self._asdict(), **kwargs})
+
+
+class CompactURL(_Record):
+    """
+    Compact counterpart of ``Configuration.URL``. URL prefixes and detector names are
+    dictionary encoded. As for ``Configuration.URL``, ``json`` is a tuple and the mappings are
+    ``entries.ReadOnlyDict``; they are rebuilt on each access.
+    """
+
+    # prefix codes of cpp, header and info are packed in a single integer
+    __slots__ = ("_prefixes", "_cpp", "_header", "_info", "_json", "_detector")
+    _fields = ("cpp", "header", "info", "json", "detector")
+    _name = "URL"
+
+
+    def __init__(self, cpp: Text, header: Text, info: Text, json: Sequence[Dict], detector: Dict):
+        codes = []
+        for field, url in [("_cpp", cpp), ("_header", header), ("_info", info)]:
+            code, suffix = _encode_url(url)
+            codes.append(code)
+            _set(self, field, suffix)
+        _set(self, "_prefixes", codes[0] | (codes[1] << 21) | (codes[2] << 42))
+        _set(self, "_json", tuple(_encode_item(item) for item in json))
+        _set(self, "_detector", _encode_item(detector))
+
+
+    def _prefix(self, position: int) -> Text:
+        return prefixes.decode((self._prefixes >> (21 * position)) & 0x1FFFFF)
+
+
+    @property
+    def cpp(self) -> Text:
+        return self._prefix(0) + self._cpp
+
+
+    @property
+    def header(self) -> Text:
+        return self._prefix(1) + self._header
+
+
+    @property
+    def info(self) -> Text:
+        return self._prefix(2) + self._info
+
+
+    @property
+    def json(self) -> Tuple[ReadOnlyDict, ...]:
+        return tuple(_decode_item(item) for item in self._json)
+
+
+    @property
+    def detector(self) -> ReadOnlyDict:
+        return _decode_item(self._detector)
+
+
+class CompactPADEntry(_Record):
+    """
+    Compact counterpart of ``Configuration.PADEntry`` with the same attributes. Versions and
+    compiler requirements are dictionary encoded and the bibliography is stored as a tuple.
+    """
+
+    __slots__ = ("name", "description", "url", "_padversion", "_ma5version", "_gcc", "_bibtex")
+    _fields = ("name", "description", "url", "padversion", "ma5version", "gcc", "bibtex")
+    _name = "PADEntry"
+
+
+    def __init__(
+            self,
+            name: Text,
+            description: Text,
+            url,
+            padversion: Text,
+            ma5version: Text,
+            gcc: Text,
+            bibtex: Sequence[Text],
+    ):
+        _set(self, "name", sys.intern(name))
+        _set(self, "description", description)
+        _set(self, "url", url if isinstance(url, CompactURL) else CompactURL(
+            **(url if isinstance(url, dict) else url._asdict())
+        ))
+        _set(self, "_padversion", categories.encode(padversion))
+        _set(self, "_ma5version", categories.encode(ma5version))
+        _set(self, "_gcc", categories.encode(gcc))
+        _set(self, "_bibtex", tuple(bibtex))
+
+
+    @classmethod
+    def from_dict(cls, entry: Dict) -> "CompactPADEntry":
+        """
+        Parameters
+        ----------
+        entry : Dict
+            JSON entry
+
+        Returns
+        -------
+        CompactPADEntry
+        """
+        return cls(**entry)
+
+
+    @property
+    def padversion(self) -> Text:
+        return categories.decode(self._padversion)
+
+
+    @property
+    def ma5version(self) -> Text:
+        return categories.decode(self._ma5version)
+
+
+    @property
+    def gcc(self) -> Text:
+        return categories.decode(self._gcc)
+
+
+    @property
+    def bibtex(self) -> Tuple[Text, ...]:
+        return self._bibtex
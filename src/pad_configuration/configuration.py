@@ -21,14 +21,44 @@
 #
 ################################################################################
 
+import io
 import json
 import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import namedtuple, OrderedDict
-from typing import Text, NamedTuple, Sequence, Union, Optional, Dict, Generator
-
-import jsonschema
-
-from .utils import json_zip, json_unzip
+from contextlib import contextmanager
+from functools import partial
+from itertools import chain
+from typing import (
+    Text, NamedTuple, Sequence, Union, Optional, Dict, Generator, Iterable, Tuple, TextIO
+)
+
+from . import binary_format, instrumentation, patch as metadata_patch
+from .bibtex import BibliographyIndex, BibRecord, citation_key, write_bibliography
+from .backends import ConflictError, SQLiteBackend, Snapshot, StorageBackend
+from .binary_format import BinaryMetadata, is_binary
+from .cache import ArtifactCache
+from .compact import CompactPADEntry
+from .entries import ChainedEntries, EntryStore, LazyEntries, OverlayStore, ReadOnlyDict
+from .fetch import ContentStore, Downloader
+from .planner import Artifact, InstallPlan, plan
+from .utils import (
+    atomic_write,
+    cpp_standard_key,
+    file_lock,
+    json_zip,
+    json_unzip,
+    parse_description,
+    version_key,
+)
+from .validation import errors as validation_errors, validate
+
+# Decoded PAD entries shared between Configuration instances.
+# {(padname, stamp, compact) : EntryStore}, see Configuration._metadata_stamp
+_metadata_cache = {}
+_cache_lock = threading.Lock()
 
 
 class Configuration:
@@ -41,6 +71,12 @@ class Configuration:
         name of the PAD which can be "PAD", "PADForMA5tune", "PADForSFS"
     pad_data: Optional[Sequence[NamedTuple]]
         create configuration with existing data structure
+    lazy : bool
+        if True, PAD entries are only created when they are accessed for the first time.
+        Names of the analyses are available without creating any entry.
+    compact : bool
+        if True, entries are stored as ``compact.CompactPADEntry`` which provide the same
+        attributes as ``Configuration.PADEntry`` with a smaller memory footprint.
 
     Raises
     ------
@@ -49,14 +85,15 @@ class Configuration:
     """
 
     _currentpath = os.path.dirname(os.path.realpath(__file__))
-    with open(os.path.join(_currentpath, "meta", "data_structure.json"), "r") as f:
-        _schema = json.load(f)
 
     PADEntry = namedtuple(
         "PADEntry",
         ["name", "description", "url", "padversion", "ma5version", "gcc", "bibtex"], )
     URL = namedtuple("URL", ["cpp", "header", "info", "json", "detector"])
     # JSON = namedtuple("JSON", ["name", "url"])
+    # entries rejected by import_entries: [(position, name, reason)]
+    ImportReport = namedtuple("ImportReport", ["imported", "rejected"])
+    _entry_types = (PADEntry, CompactPADEntry)
 
     _paddata = {
         "PAD"          : os.path.join(_currentpath, "meta", "pad_data.json"),
@@ -64,59 +101,363 @@ class Configuration:
         "PADForSFS"    : os.path.join(_currentpath, "meta", "padforsfs_data.json"),
     }
 
+    # Metadata file formats and their extensions, in order of precedence
+    _formats = OrderedDict(
+        [("json", ".json"), ("binary", ".jzb"), ("jz", ".jz"), ("sqlite", ".sqlite")]
+    )
+    # Formats stored in databases which are updated in place, see backends.StorageBackend
+    _backends = OrderedDict([("sqlite", SQLiteBackend)])
+
+    # attributes of the entries read from the storage backend, see Configuration._attribute_index
+    _stored_attributes = None
+
 
-    def __init__(self, padname: Text, pad_data: Optional[Sequence[NamedTuple]] = None):
+    def __init__(
+            self,
+            padname: Text,
+            pad_data: Optional[Sequence[NamedTuple]] = None,
+            lazy: bool = False,
+            compact: bool = False,
+    ):
         assert padname in ["PAD", "PADForMA5tune", "PADForSFS", "combined"], \
             f"Unknown PAD name: {padname}"
 
         self.padname = padname
+        self.lazy = lazy
+        self.compact = compact
 
         if pad_data is None:
             assert padname != "combined", "Combined configuration requires independent data."
-            tmp_json = []
-            if os.path.isfile(Configuration._paddata[padname]):
-                with open(Configuration._paddata[padname], "r") as tmp:
-                    tmp_json = json.load(tmp)
-            elif os.path.isfile(Configuration._paddata[padname].split(".")[0] + ".jz"):
-                tmp_json = self._decompress(
-                    Configuration._paddata[padname].split(".")[0] + ".jz"
-                )
+            store = Configuration._load(padname, compact)
+            if lazy:
+                self.pad_data = LazyEntries(store)
             else:
-                raise FileNotFoundError(
-                    f"Can not find metadata files: \n\t"
-                    f" - {Configuration._paddata[padname]}\n\t"
-                    f" - {Configuration._paddata[padname].split('.')[0]}.jz")
-
-            self.pad_data = []
-            for entry in tmp_json:
-                # entry["url"].update({"json" : [JSON(**jin) for jin in entry["url"]["json"]]})
-                entry.update({"url": Configuration.URL(**entry["url"])})
-                self.pad_data.append(Configuration.PADEntry(**entry))
+                with instrumentation.phase("load.entries", len(store)):
+                    self.pad_data = list(store)
+            # metadata file which is expected to be replaced by the next modification
+            self._stamp = store.stamp
+            self._stored_attributes = getattr(store.source, "attributes", None)
         else:
             assert isinstance(pad_data, list) and \
-                   all([isinstance(x, Configuration.PADEntry) for x in pad_data]), \
+                   all([isinstance(x, Configuration._entry_types) for x in pad_data]), \
                 "Unknown data type."
             self.pad_data = pad_data
+            self._stamp = None
+
+        self._transaction = None
+        # indexes and results derived from the entries, see Configuration._invalidate
+        self._derived = {}
+        self._revision = 0
+        self._build_index()
 
 
     @staticmethod
-    def _compress(filename: Text, json_input: Union[Sequence[Dict], Dict]) -> None:
-        compressed_pad_data = json_zip(json_input)
-        with open(filename, "w") as f:
-            f.write(compressed_pad_data)
+    def _metadata_files(padname: Text) -> Sequence[Text]:
+        """
+        Candidate metadata files for a given PAD, see ``Configuration._formats``.
+        """
+        stem = os.path.splitext(Configuration._paddata[padname])[0]
+        return [stem + extension for extension in Configuration._formats.values()]
 
 
     @staticmethod
-    def _decompress(filename: Text) -> Union[Sequence[Dict], Dict]:
+    def _metadata_file(padname: Text) -> Optional[Text]:
+        """
+        The first existing file in the order of ``Configuration._formats`` is used. Writing
+        the metadata removes the files of the other formats (see ``save``), hence several
+        files only exist if they have been copied by hand.
+
+        Returns
+        -------
+        Optional[Text]
+            path of the metadata file that will be loaded for the given PAD, None if there is
+            no metadata file.
+        """
+        for filename in Configuration._metadata_files(padname):
+            if os.path.isfile(filename):
+                return filename
+        return None
+
+
+    @staticmethod
+    def _remove(filename: Text) -> None:
+        """
+        Delete a metadata file, databases of the storage backends are deleted by the backend.
+        """
+        file_format = Configuration._file_format(filename)
+        if file_format in Configuration._backends:
+            Configuration._backends[file_format](filename).remove()
+        else:
+            os.remove(filename)
+
+
+    @staticmethod
+    def _metadata_stamp(padname: Text) -> Optional[Tuple]:
+        """
+        Identity of the current metadata file of a PAD. Files are always replaced when they
+        are written, hence the stamp changes with every write. Databases of the storage
+        backends are updated in place, their revision is used instead of the modification
+        time and size.
+
+        Returns
+        -------
+        Optional[Tuple]
+            path, inode, modification time and size of the metadata file, None if there is no
+            metadata file.
+        """
+        filename = Configuration._metadata_file(padname)
+        if filename is None:
+            return None
+        return Configuration._file_stamp(filename, Configuration._file_format(filename))
+
+
+    @staticmethod
+    def _file_stamp(filename: Text, file_format: Text) -> Tuple:
+        stat = os.stat(filename)
+        if file_format in Configuration._backends:
+            revision = Configuration._backends[file_format](filename).revision()
+            return filename, stat.st_ino, revision, None
+        return filename, stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+    @staticmethod
+    def register_backend(format: Text, extension: Text, backend: type) -> None:
+        """
+        Store metadata with a new storage backend, see ``backends.StorageBackend``. Metadata
+        is written with the backend by ``save(..., format = format)``, and read from files
+        with the given extension if they are detected by the backend.
+
+        Parameters
+        ----------
+        format : Text
+            name of the format
+        extension : Text
+            extension of the metadata files e.g. ".sqlite"
+        backend : type
+            subclass of ``backends.StorageBackend``
+        """
+        assert issubclass(backend, StorageBackend), "Unknown storage backend."
+        assert format not in ["json", "binary", "jz"], f"{format} format can not be replaced."
+        Configuration._formats[format] = extension
+        Configuration._backends[format] = backend
+
+
+    @staticmethod
+    def _metadata_lock(padname: Text):
+        """
+        Advisory lock held while the metadata of a PAD is written, see ``utils.file_lock``.
+        """
+        directory, name = os.path.split(Configuration._paddata[padname])
+        return file_lock(os.path.join(directory, "." + os.path.splitext(name)[0] + ".lock"))
+
+
+    @staticmethod
+    def _file_format(filename: Text) -> Text:
+        """
+        Detect the format of a metadata file from its content.
+
+        Returns
+        -------
+        Text
+            "binary", "jz", "json" or the format of a storage backend e.g. "sqlite"
+        """
+        if is_binary(filename):
+            return "binary"
+        for file_format, backend in Configuration._backends.items():
+            if backend.detect(filename):
+                return file_format
         with open(filename, "r") as f:
-            output = json_unzip(f.readlines())
-        return output
+            header = f.readline()
+        return "jz" if header.startswith("# Ma5 - PAD metadata") else "json"
 
 
     @staticmethod
-    def save(
-            padname: Text, json_input: Union[Sequence[Dict], Dict], compress: bool = True
+    def _load(padname: Text, compact: bool = False) -> EntryStore:
+        """
+        Read the metadata of a PAD. Decoded entries are shared between configurations through a
+        process wide cache which is keyed on the metadata file path, modification time and
+        size, hence a modified file is always re-read. PAD entries are created on demand by
+        the returned store.
+
+        Parameters
+        ----------
+        padname : Text
+            name of the PAD which can be "PAD", "PADForMA5tune", "PADForSFS"
+        compact : bool
+            create ``compact.CompactPADEntry`` instead of ``Configuration.PADEntry``
+
+        Returns
+        -------
+        EntryStore
+            shared PAD entries
+
+        Raises
+        ------
+        FileNotFoundError
+            if metadata file does not exist
+        """
+        filename = Configuration._metadata_file(padname)
+        if filename is None:
+            raise FileNotFoundError(
+                "Can not find metadata files: \n\t - " +
+                "\n\t - ".join(Configuration._metadata_files(padname))
+            )
+
+        file_format = Configuration._file_format(filename)
+        stamp = Configuration._file_stamp(filename, file_format)
+        key = (padname, stamp, compact)
+        with _cache_lock:
+            store = _metadata_cache.get(key, None)
+        if store is not None:
+            instrumentation.record("load.cache_hit")
+            return store
+
+        factory = partial(Configuration._make_entry, compact=compact)
+        size = os.path.getsize(filename)
+        with instrumentation.phase("load", size):
+            if file_format == "binary":
+                # entries are decoded from the memory mapped file when they are accessed
+                reader = BinaryMetadata(filename)
+                store = EntryStore(reader, factory, names=reader.names, stamp=stamp)
+            elif file_format in Configuration._backends:
+                # entries are decoded when they are accessed, from a consistent view of the
+                # database which may have been modified since the stamp has been taken
+                reader = Configuration._backends[file_format](filename).snapshot()
+                stamp = stamp[:2] + (reader.revision, None)
+                key = (padname, stamp, compact)
+                store = EntryStore(reader, factory, names=reader.names, stamp=stamp)
+            else:
+                if file_format == "json":
+                    with instrumentation.phase("load.read", size):
+                        with open(filename, "r") as tmp:
+                            text = tmp.read()
+                    with instrumentation.phase("load.json"):
+                        tmp_json = json.loads(text)
+                else:
+                    tmp_json = Configuration._decompress(filename)
+                store = EntryStore(tmp_json, factory, stamp=stamp)
+
+        Configuration._cache_store(key, store)
+        return store
+
+
+    @staticmethod
+    def _cache_store(key: Tuple, store: EntryStore) -> None:
+        """
+        Share decoded entries, the entries of the previous versions of the metadata are
+        dropped.
+        """
+        with _cache_lock:
+            for stale in [k for k in _metadata_cache if k[0] == key[0] and k[1] != key[1]]:
+                Configuration._release(_metadata_cache.pop(stale))
+            _metadata_cache[key] = store
+
+
+    @staticmethod
+    def _release(store: EntryStore) -> None:
+        # database snapshots are reopened if lazy configurations still use them
+        if isinstance(store.source, Snapshot):
+            store.source.close()
+
+
+    @staticmethod
+    def _make_entry(entry: Dict, compact: bool = False) -> NamedTuple:
+        """
+        Convert a JSON entry into a PAD entry. Entries are shared between configurations,
+        their containers are read-only: ``bibtex`` and ``url.json`` are tuples, ``url.detector``
+        and the items of ``url.json`` are ``entries.ReadOnlyDict``.
+        """
+        if compact:
+            return CompactPADEntry.from_dict(entry)
+        url = entry["url"]
+        return Configuration.PADEntry(**{
+            **entry,
+            "url": Configuration.URL(**{
+                **url,
+                "json": tuple(ReadOnlyDict(x) for x in url["json"]),
+                "detector": ReadOnlyDict(url["detector"]),
+            }),
+            "bibtex": tuple(entry["bibtex"]),
+        })
+
+
+    @staticmethod
+    def clear_cache(padname: Optional[Text] = None) -> None:
+        """
+        Drop decoded metadata shared between configurations.
+
+        Parameters
+        ----------
+        padname : Optional[Text]
+            only drop the cache of the given PAD. If None, the entire cache is cleared.
+        """
+        with _cache_lock:
+            for key in list(_metadata_cache.keys()):
+                if padname is None or key[0] == padname:
+                    Configuration._release(_metadata_cache.pop(key))
+
+
+    def _build_index(self) -> None:
+        """
+        Build the analysis name to position map. If the same analysis name appears more than
+        once, i.e. in combined configurations, the first occurrence is kept.
+        """
+        self._index = {}
+        for idx, name in enumerate(self._names()):
+            self._index.setdefault(name, idx)
+
+
+    def _invalidate(self) -> None:
+        """
+        Drop the indexes and results derived from the entries, they will be rebuilt on demand.
+        """
+        self._derived = {}
+        self._revision += 1
+        self._stored_attributes = None
+
+
+    def _names(self) -> Sequence[Text]:
+        """
+        Analysis names in the order of the entries, without creating lazy entries.
+        """
+        if isinstance(self.pad_data, LazyEntries):
+            return self.pad_data.names
+        return [entry.name for entry in self.pad_data]
+
+
+    @staticmethod
+    def _compress(
+            filename: Text,
+            json_input: Union[Sequence[Dict], Dict],
+            codec: Text = "zlib",
+            format: Text = "jz",
     ) -> None:
+        if format == "binary":
+            atomic_write(filename, binary_format.dumps(json_input, codec))
+        else:
+            atomic_write(filename, json_zip(json_input, codec))
+
+
+    @staticmethod
+    def _decompress(filename: Text) -> Union[Sequence[Dict], Dict]:
+        if is_binary(filename):
+            with open(filename, "rb") as f:
+                return binary_format.loads(f.read())
+        with instrumentation.phase("load.read") as current:
+            with open(filename, "r") as f:
+                lines = f.readlines()
+            current.bytes = sum(len(line) for line in lines)
+        return json_unzip(lines)
+
+
+    @staticmethod
+    def save(
+            padname: Text,
+            json_input: Union[Sequence[Dict], Dict],
+            compress: bool = True,
+            format: Optional[Text] = None,
+            codec: Text = "zlib",
+    ) -> Text:
         """
         Save current PAD configuration
 
@@ -128,6 +469,19 @@ class Configuration:
             PAD metadata
         compress : bool
             Should data be compressed?
+        format : Optional[Text]
+            "jz" (base64 encoded compressed JSON), "binary" (indexed binary file, see
+            ``binary_format``), "json" or the format of a storage backend e.g. "sqlite". If
+            None, compressed data is written in the format of the current compressed metadata
+            file, "jz" by default. Metadata files of the other formats are removed, the
+            written file is the one loaded afterwards.
+        codec : Text
+            compression codec, see ``utils.register_codec``.
+
+        Returns
+        -------
+        Text
+            path of the written file
 
         Raises
         ------
@@ -137,12 +491,47 @@ class Configuration:
         assert padname in ["PAD", "PADForMA5tune", "PADForSFS"], \
             f"Configuration can only be saved if padname is PAD, PADForMA5tune or PADForSFS"
 
-        if compress:
-            filename = Configuration._paddata[padname].split(".")[0] + ".jz"
-            Configuration._compress(filename, json_input)
-        else:
-            with open(Configuration._paddata[padname], "w") as f:
-                json.dump(json_input, f, indent = 4)
+        with Configuration._metadata_lock(padname):
+            return Configuration._write(padname, json_input, compress, format, codec)
+
+
+    @staticmethod
+    def _write(
+            padname: Text,
+            json_input: Union[Sequence[Dict], Dict],
+            compress: bool = True,
+            format: Optional[Text] = None,
+            codec: Text = "zlib",
+    ) -> Text:
+        """
+        Write the metadata of a PAD, see ``save``. The caller holds the metadata lock.
+        """
+        if format is None:
+            format = "jz" if compress else "json"
+            current = Configuration._metadata_file(padname)
+            if compress and current is not None:
+                current_format = Configuration._file_format(current)
+                if current_format == "binary" or current_format in Configuration._backends:
+                    format = current_format
+        assert format in Configuration._formats, f"Unknown format: {format}"
+
+        filename = os.path.splitext(
+            Configuration._paddata[padname]
+        )[0] + Configuration._formats[format]
+        with instrumentation.phase("save") as current:
+            if format in Configuration._backends:
+                Configuration._backends[format](filename).write(json_input)
+            elif format != "json":
+                Configuration._compress(filename, json_input, codec, format)
+            else:
+                atomic_write(filename, json.dumps(json_input, indent = 4))
+            current.bytes = os.path.getsize(filename)
+
+        for superseded in Configuration._metadata_files(padname):
+            if superseded != filename and os.path.isfile(superseded):
+                Configuration._remove(superseded)
+        Configuration.clear_cache(padname)
+        return filename
 
 
     def _asdict(self) -> Sequence[Dict]:
@@ -152,12 +541,33 @@ class Configuration:
         Sequence[Dict]:
             PAD datastructure as dictionary
         """
-        to_return = []
-        for entry in self.pad_data:
-            entry = entry._asdict()
-            entry.update({"url" : entry["url"]._asdict()})
-            to_return.append(entry)
-        return to_return
+        return [Configuration._entry_to_dict(entry) for entry in self.pad_data]
+
+
+    def _entry_dicts(self) -> Sequence[Dict]:
+        """
+        Entries as dictionaries to be written. Entries of a lazy configuration which have not
+        been accessed are not created, hence the dictionaries must not be modified.
+        """
+        if isinstance(self.pad_data, LazyEntries):
+            return list(self.pad_data.entry_dicts(Configuration._entry_to_dict))
+        return [Configuration._entry_to_dict(entry) for entry in self.pad_data]
+
+
+    @staticmethod
+    def _entry_to_dict(entry: NamedTuple) -> Dict:
+        """
+        Convert a PAD entry into a dictionary. Containers are copied so that the returned
+        dictionary can be modified without altering the (shared) entry.
+        """
+        entry_dict = entry._asdict()
+        url = entry.url._asdict()
+        url.update({
+            "json"    : [dict(x) for x in url["json"]],
+            "detector": dict(url["detector"]),
+        })
+        entry_dict.update({"url": url, "bibtex": list(entry.bibtex)})
+        return entry_dict
 
 
     def entry_asdict(self, analysis: Text) -> Dict:
@@ -175,9 +585,7 @@ class Configuration:
         """
         entry = self[analysis]
         if entry is not None:
-            entry_dict = entry._asdict()
-            entry_dict.update({"url" : entry["url"]._asdict()})
-            return entry_dict
+            return Configuration._entry_to_dict(entry)
 
 
     def update_entry(self, analysis: Text, entry: Union[Sequence[Dict], Dict]) -> None:
@@ -194,31 +602,331 @@ class Configuration:
         Raises
         ------
         AssertionError
-            If analysis does not exist, entry is neither list nor dict or more than one entry
-            given.
+            If analysis does not exist, entry is neither list nor dict, more than one entry
+            given or the entry is renamed after another analysis of the configuration.
         jsonschema.exceptions.ValidationError:
             invalid new entry
         jsonschema.exceptions.SchemaError:
             invalid new entry
+        ConflictError:
+            metadata has been modified since the configuration has been loaded.
         """
-        assert analysis in list(self.keys()), f"Can't find {analysis} in {self.padname}."
+        assert analysis in self, f"Can't find {analysis} in {self.padname}."
         if isinstance(entry, dict):
-            new_entry = [entry]
-        assert isinstance(new_entry, list), "Unknown entry type."
+            entry = [entry]
+        assert isinstance(entry, list), "Unknown entry type."
         assert len(entry) == 1, f"Only one entry expected, got {len(entry)}."
 
-        jsonschema.validate(new_entry, Configuration._schema)
-        pad_data = self._asdict()
-        for idx, entry in enumerate(pad_data):
-            if entry["name"] == analysis:
-                break
-        pad_data[idx] = new_entry[0]
+        self._modify({self._index[analysis]: entry[0]})
+
+
+    def _modify(
+            self,
+            changes: Optional[Dict[int, Dict]] = None,
+            additions: Sequence[Dict] = (),
+            validated: bool = False,
+    ) -> None:
+        """
+        Replace or add entries of the current configuration and write the PAD metadata. The
+        configuration and its index are updated in place. Within a transaction the changes are
+        only staged in memory.
+
+        Parameters
+        ----------
+        changes : Optional[Dict[int, Dict]]
+            new entries as dictionaries, keyed by their position in the configuration
+        additions : Sequence[Dict]
+            entries to be appended to the configuration
+        validated : bool
+            skip the validation if the entries have already been validated
+
+        Raises
+        ------
+        AssertionError
+            if an entry is renamed after another analysis of the configuration.
+        jsonschema.exceptions.ValidationError:
+            invalid new entry
+        ConflictError:
+            metadata has been modified since the configuration has been loaded.
+        """
+        changes = changes or {}
+        self._check_renames(changes)
+        if self._transaction is None and not validated:
+            # Only the new entries need to be validated, the rest of the database is unchanged
+            validate(list(changes.values()) + list(additions))
+
+        # entries to be restored if the metadata can not be written
+        undo = None
+        if self._transaction is None:
+            undo = ({idx: self.pad_data[idx] for idx in changes}, len(self.pad_data))
+        rebuild_index = False
+        for idx, entry in changes.items():
+            rebuild_index |= self.pad_data[idx].name != entry["name"]
+            self.pad_data[idx] = Configuration._make_entry(entry, self.compact)
+        touched = list(changes.keys())
+        for entry in additions:
+            touched.append(len(self.pad_data))
+            self._index.setdefault(entry["name"], len(self.pad_data))
+            self.pad_data.append(Configuration._make_entry(entry, self.compact))
+        if rebuild_index:
+            self._build_index()
+        self._invalidate()
+
+        if self._transaction is not None:
+            self._transaction.update(touched)
+            return
+
+        try:
+            self._save(positions=touched)
+        except BaseException:
+            self._undo(*undo)
+            raise
+
+
+    def _undo(self, previous: Dict[int, NamedTuple], size: int) -> None:
+        """
+        Restore the entries replaced by ``_modify`` and remove the added ones.
+        """
+        for idx, entry in previous.items():
+            self.pad_data[idx] = entry
+        del self.pad_data[size:]
+        self._build_index()
+        self._invalidate()
+
+
+    def _check_renames(self, changes: Dict[int, Dict]) -> None:
+        """
+        Make sure that modified entries are not renamed after another analysis.
+
+        Raises
+        ------
+        AssertionError
+            if two entries would have the same name.
+        """
+        names = [entry["name"] for entry in changes.values()]
+        assert len(set(names)) == len(names), "Entries can not be renamed after each other."
+        for idx, entry in changes.items():
+            # the name may be freed by another change of the same call
+            owner = self._index.get(entry["name"], idx)
+            assert owner == idx or (owner in changes and changes[owner]["name"] != entry["name"]), \
+                f"{entry['name']} already exists in {self.padname}."
+
+
+    def _save(
+            self,
+            json_input: Optional[Sequence[Dict]] = None,
+            positions: Optional[Sequence[int]] = None,
+    ) -> None:
+        """
+        Write the current configuration and share its entries with the configurations that
+        will be created afterwards, instead of decoding the file that has just been written.
+
+        Parameters
+        ----------
+        json_input : Optional[Sequence[Dict]]
+            current entries as dictionaries if they are already available
+        positions : Optional[Sequence[int]]
+            positions of the modified and added entries, if the metadata is stored by a storage
+            backend only these entries are written. If None, all entries are written. The
+            shared entries of the previous version are reused for the other positions.
+
+        Raises
+        ------
+        ConflictError
+            if the metadata file has been replaced since the configuration has been loaded.
+        """
+        with Configuration._metadata_lock(self.padname):
+            if Configuration._metadata_stamp(self.padname) != self._stamp:
+                raise ConflictError(
+                    f"{self.padname} metadata has been modified since this configuration has "
+                    f"been loaded. Please create a new configuration and apply the "
+                    f"modifications again."
+                )
+            previous_key = (self.padname, self._stamp, self.compact)
+            current = self._stamp[0] if self._stamp is not None else None
+            file_format = Configuration._file_format(current) if current is not None else None
+            if positions is not None and file_format in Configuration._backends:
+                Configuration._backends[file_format](current).update(
+                    {idx: Configuration._entry_to_dict(self.pad_data[idx]) for idx in positions},
+                    len(self.pad_data),
+                )
+            else:
+                # modifications are written in the format of the current metadata file
+                Configuration._write(
+                    self.padname,
+                    json_input if json_input is not None else self._entry_dicts(),
+                    format=file_format,
+                )
+            self._stamp = Configuration._metadata_stamp(self.padname)
+
+        with _cache_lock:
+            previous = _metadata_cache.get(previous_key, None)
+        if positions is not None and previous is not None:
+            # only the modified entries differ from the previous version of the metadata
+            store = OverlayStore(
+                previous,
+                {idx: self.pad_data[idx] for idx in positions},
+                len(self.pad_data),
+                stamp=self._stamp,
+            )
+        elif isinstance(self.pad_data, LazyEntries):
+            entries = self.pad_data.copy()
+            store = EntryStore(entries, lambda entry: entry, names=entries.names, stamp=self._stamp)
+        else:
+            store = EntryStore.from_entries(self.pad_data.copy(), self._stamp)
+        Configuration._cache_store((self.padname, self._stamp, self.compact), store)
+
+
+    def _rollback(self, snapshot: Sequence[NamedTuple]) -> None:
+        self.pad_data = snapshot
+        self._build_index()
+        self._invalidate()
+
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group modifications of the current configuration. Within the context, ``update_entry``,
+        ``add_json_info`` and ``add_bibtex_info`` only modify the configuration in memory. At
+        the end of the context modified entries are validated and metadata is written once.
+        If an exception is raised, none of the modifications are kept.
+
+        .. code-block:: python
+
+            config = Configuration("PADForSFS")
+            with config.transaction():
+                config.add_json_info("atlas_susy_2018_31", json_entry)
+                config.add_bibtex_info("atlas_susy_2018_31", bibentry)
+
+        Raises
+        ------
+        AssertionError
+            if the configuration can not be saved.
+        jsonschema.exceptions.ValidationError:
+            invalid modified entry
+        ConflictError:
+            metadata has been modified since the configuration has been loaded.
+        """
+        assert self.padname in ["PAD", "PADForMA5tune", "PADForSFS"], \
+            "Only PAD, PADForMA5tune or PADForSFS configurations can be modified."
+
+        if self._transaction is not None:
+            # nested transaction is a part of the outer one
+            yield self
+            return
+
+        snapshot = self.pad_data.copy()
+        self._transaction = set()
+        try:
+            yield self
+            if len(self._transaction) > 0:
+                validate([Configuration._entry_to_dict(self.pad_data[idx])
+                          for idx in sorted(self._transaction)])
+                self._save(positions=sorted(self._transaction))
+        except BaseException:
+            self._rollback(snapshot)
+            raise
+        finally:
+            self._transaction = None
+
+
+    batch = transaction
+
+
+    def diff(self, other: "Configuration") -> Dict:
+        """
+        Compute the patch transforming the current configuration into another one, e.g. the
+        metadata of a new release. Mirrors can apply the patch instead of downloading and
+        decoding the entire metadata.
+
+        .. code-block:: python
+
+            patch = Configuration("PAD").diff(new_release)
+            pad_configuration.patch.write_patch("pad.jzp", patch)
+
+        Parameters
+        ----------
+        other : Configuration
+            modified configuration
+
+        Returns
+        -------
+        Dict
+            removed analyses, added entries and modified fields, see ``patch``.
+        """
+        return metadata_patch.diff(self._asdict(), other._asdict())
+
+
+    def apply_patch(self, patch: Union[Dict, Text], verify: bool = True) -> None:
+        """
+        Apply a patch computed by ``diff`` to the current configuration and write the PAD
+        metadata. Only the removed, added and modified entries are updated in memory, the
+        other entries are kept as they are. Within a transaction the changes are only staged.
+
+        Parameters
+        ----------
+        patch : Union[Dict, Text]
+            patch or path of a patch file, see ``patch.write_patch``.
+        verify : bool
+            check the sha256 of the metadata before and after applying the patch.
 
-        jsonschema.validate(pad_data, Configuration._schema)
-        Configuration.save(self.padname, pad_data)
+        Raises
+        ------
+        AssertionError
+            if the configuration can not be saved.
+        patch.PatchError
+            if the patch does not apply to the current metadata or does not produce the
+            expected metadata.
+        jsonschema.exceptions.ValidationError:
+            invalid new entry
+        ConflictError:
+            metadata has been modified since the configuration has been loaded.
+        """
+        assert self.padname in ["PAD", "PADForMA5tune", "PADForSFS"], \
+            "Only PAD, PADForMA5tune or PADForSFS configurations can be modified."
+        if isinstance(patch, str):
+            patch = metadata_patch.read_patch(patch)
+        metadata_patch.check(patch)
+        if metadata_patch.is_empty(patch):
+            return
+
+        entries = metadata_patch.apply(self._asdict(), patch, verify)
+        touched = set(patch["changed"]) | set(patch["unset"]) | \
+            {entry["name"] for entry in patch["added"]}
+        new_entries = [entry for entry in entries if entry["name"] in touched]
+        if self._transaction is None:
+            validate(new_entries)
+
+        snapshot = self.pad_data.copy()
+        removed = set(patch["removed"])
+        for idx in reversed(range(len(self.pad_data))):
+            if self.pad_data[idx].name in removed:
+                del self.pad_data[idx]
+        positions = {name: idx for idx, name in enumerate(self._names())}
+        for entry in new_entries:
+            new = Configuration._make_entry(entry, self.compact)
+            if entry["name"] in positions:
+                self.pad_data[positions[entry["name"]]] = new
+            else:
+                self.pad_data.append(new)
+        if "order" in patch:
+            position = {name: idx for idx, name in enumerate(patch["order"])}
+            self.pad_data = sorted(self.pad_data, key=lambda entry: position[entry.name])
+        self._build_index()
+        self._invalidate()
+
+        if self._transaction is not None:
+            self._transaction.update(self._index[name] for name in touched)
+            if removed or "order" in patch:
+                # positions of the staged entries have changed
+                self._transaction.update(range(len(self.pad_data)))
+            return
 
-        # Reinitialize the current configuration
-        self.__init__(self.padname)
+        try:
+            self._save(entries)
+        except BaseException:
+            self._rollback(snapshot)
+            raise
 
 
     @property
@@ -240,6 +948,10 @@ class Configuration:
         return len(self.pad_data)
 
 
+    def __contains__(self, analysis: Text) -> bool:
+        return analysis in self._index
+
+
     def __getitem__(self, item: Union[int, Text]) -> NamedTuple:
         if isinstance(item, int):
             return self.pad_data[item]
@@ -261,12 +973,64 @@ class Configuration:
         Generator:
             Get all the analysis names available within current PAD config
         """
-        return (x.name for x in self)
+        return (x for x in self._names())
+
+
+    def _positions(self) -> Sequence[int]:
+        """
+        Positions of the entries provided by the configuration, in order.
+        """
+        return range(len(self.pad_data))
+
+
+    def _subset(self, positions: Sequence[int]) -> "Configuration":
+        """
+        Configuration limited to the entries at the given positions, in this order. Entries are
+        shared with the current configuration.
+        """
+        return Configuration(
+            self.padname, [self.pad_data[idx] for idx in positions], compact=self.compact
+        )
+
+
+    def _version_index(self) -> Tuple[array, array, array]:
+        """
+        Minimum MadAnalysis 5 and C++ versions of the entries, parsed once and sorted by the
+        MadAnalysis 5 version.
+
+        Returns
+        -------
+        Tuple[array, array, array]
+            sorted MadAnalysis 5 version keys, corresponding entry positions and C++
+            standards (see ``utils.version_key`` and ``utils.cpp_standard_key``)
+        """
+        if "versions" not in self._derived:
+            stored = self._stored_attributes
+            if stored is not None and all(
+                    None not in (attrs.ma5version_key, attrs.gcc_key) for attrs in stored
+            ):
+                parsed = sorted(
+                    (stored[idx].ma5version_key, idx, stored[idx].gcc_key)
+                    for idx in self._positions()
+                )
+            else:
+                parsed = sorted(
+                    (version_key(entry.ma5version), idx, cpp_standard_key(entry.gcc))
+                    for idx, entry in ((x, self.pad_data[x]) for x in self._positions())
+                )
+            self._derived["versions"] = (
+                array("Q", [x[0] for x in parsed]),
+                array("Q", [x[1] for x in parsed]),
+                array("H", [x[2] for x in parsed]),
+            )
+        return self._derived["versions"]
 
 
     def filter(self, ma5version: Text, gcc: int):
         """
-        Filter the pad metadata with respect to current MadAnalysis 5 and gcc compiler version
+        Filter the pad metadata with respect to current MadAnalysis 5 and gcc compiler version.
+        Results are memoised until the configuration is modified.
+
         Parameters
         ----------
         ma5version : Text
@@ -277,34 +1041,127 @@ class Configuration:
         Returns
         -------
         Configuration
-            new configuration limited only to the filtered entries
+            new configuration limited only to the filtered entries. Entries are shared with the
+            current configuration.
         """
-        if ma5version.startswith("v"):
-            ma5version = [int(x) for x in entry.ma5version[1:].split(".")]
-        else:
-            ma5version = [int(x) for x in entry.ma5version.split(".")]
+        key = (version_key(ma5version), cpp_standard_key(gcc))
+        filtered = self._derived.setdefault("filter", {})
+        if key not in filtered:
+            ma5_keys, positions, cpp_keys = self._version_index()
+            # entries requiring at most the local MadAnalysis 5 version
+            nentries = bisect_right(ma5_keys, key[0])
+            selected = sorted(
+                positions[idx] for idx in range(nentries) if cpp_keys[idx] <= key[1]
+            )
+            filtered[key] = self._subset(selected)
+        return filtered[key]
 
-        tmp = []
-        for entry in self.pad_data:
-            entry_vma5 = [int(x) for x in entry.ma5version[1:].split(".")]
-            entry_vgcc = int(entry.gcc)
 
-            ma5_check = [x >= y for x, y in
-                         zip(ma5version[:len(current_ma5version)], entry_vma5)] + [True] * (
-                                3 - len(current_ma5version))
+    def _attribute_index(self) -> Dict:
+        """
+        Collaboration, sqrt(s) and integrated luminosity of the entries, parsed once from
+        the analysis names and descriptions, and inverted indexes over these and the PAD
+        version. Kept until the configuration is modified.
 
-            if not ma5_check[0]:
-                continue
-            if ma5_check[0] and not ma5_check[1]:
-                continue
-            if ma5_check[0] and ma5_check[1] and not ma5_check[2]:
-                continue
-            if gcc < entry_vgcc:
-                continue
+        Returns
+        -------
+        Dict
+            ``collaboration``, ``sqrt_s`` and ``padversion`` map a value to the sorted
+            positions of the entries; ``lumi`` holds the sorted luminosities and the
+            corresponding positions.
+        """
+        if "attributes" not in self._derived:
+            index = {"collaboration": {}, "sqrt_s": {}, "padversion": {}}
+            luminosities = []
+            for idx, (collaboration, padversion, sqrt_s, lumi) in zip(
+                    self._positions(), self._attributes()
+            ):
+                index["collaboration"].setdefault(collaboration, []).append(idx)
+                index["padversion"].setdefault(padversion, []).append(idx)
+                if sqrt_s is not None:
+                    index["sqrt_s"].setdefault(sqrt_s, []).append(idx)
+                if lumi is not None:
+                    luminosities.append((lumi, idx))
+            luminosities.sort()
+            index["lumi"] = (
+                array("d", [x[0] for x in luminosities]), array("Q", [x[1] for x in luminosities])
+            )
+            self._derived["attributes"] = index
+        return self._derived["attributes"]
+
+
+    def _attributes(self) -> Generator:
+        """
+        Collaboration, PAD version, sqrt(s) and integrated luminosity of the entries, in the
+        order of ``Configuration._positions``. Read from the storage backend if available,
+        without creating the entries.
+        """
+        if self._stored_attributes is not None:
+            for idx in self._positions():
+                attrs = self._stored_attributes[idx]
+                yield attrs.collaboration, attrs.padversion, attrs.sqrt_s, attrs.lumi
+            return
+        for idx in self._positions():
+            entry = self.pad_data[idx]
+            # analysis names start with the collaboration e.g. atlas_susy_2018_31
+            sqrt_s, lumi = parse_description(entry.description)
+            yield entry.name.split("_", 1)[0].lower(), entry.padversion, sqrt_s, lumi
+
+
+    def query(
+            self,
+            collaboration: Optional[Text] = None,
+            sqrt_s: Optional[float] = None,
+            min_lumi: Optional[float] = None,
+            padversion: Optional[Text] = None,
+    ):
+        """
+        Select the entries matching all the given criteria. Criteria which are None are
+        ignored.
+
+        .. code-block:: python
+
+            config.query(collaboration = "cms", sqrt_s = 13, min_lumi = 100.)
+
+        Parameters
+        ----------
+        collaboration : Optional[Text]
+            collaboration name e.g. "atlas" or "cms"
+        sqrt_s : Optional[float]
+            centre-of-mass energy in TeV
+        min_lumi : Optional[float]
+            minimum integrated luminosity in fb^-1
+        padversion : Optional[Text]
+            PAD version e.g. "vSFS"
 
-            tmp.append(entry)
+        Returns
+        -------
+        Configuration
+            new configuration limited to the selected entries, in their original order.
+            Entries are shared with the current configuration.
+        """
+        index = self._attribute_index()
+        selections = []
+        if collaboration is not None:
+            selections.append(index["collaboration"].get(collaboration.lower(), []))
+        if sqrt_s is not None:
+            selections.append(index["sqrt_s"].get(float(sqrt_s), []))
+        if padversion is not None:
+            selections.append(index["padversion"].get(padversion, []))
+        if min_lumi is not None:
+            luminosities, positions = index["lumi"]
+            selections.append(positions[bisect_left(luminosities, min_lumi):])
+
+        if len(selections) == 0:
+            selected = self._positions()
+        else:
+            selections.sort(key=len)
+            selected = set(selections[0])
+            for selection in selections[1:]:
+                selected.intersection_update(selection)
+            selected = sorted(selected)
 
-        return Configuration(self.padname, tmp)
+        return self._subset(selected)
 
 
     def get_analysis(self, analysis: Text) -> NamedTuple:
@@ -321,11 +1178,10 @@ class Configuration:
         NamedTuple or None
             analysis metadata. Returns None if analysis does not exist.
         """
-        for entry in self.pad_data:
-            if entry.name == analysis:
-                return entry
-
-        return None
+        idx = self._index.get(analysis, None)
+        if idx is None:
+            return None
+        return self.pad_data[idx]
 
 
     def get_collaboration(self, collaboration: Text) -> Generator:
@@ -343,7 +1199,8 @@ class Configuration:
             PAD metadata
         """
         assert collaboration in ["atlas", "cms"], f"Unknown collaboration: {collaboration}"
-        return (entry for entry in self if collaboration in entry.name)
+        positions = self._attribute_index()["collaboration"].get(collaboration, [])
+        return (self.pad_data[idx] for idx in positions)
 
 
 
@@ -368,6 +1225,8 @@ class Configuration:
         AssertionError:
             invalid PAD name
             invalid entry type
+        ConflictError:
+            metadata kept being modified by other processes
         """
         assert padname in ["PAD", "PADForMA5tune", "PADForSFS"], \
             f"Unknown PAD name: {padname}"
@@ -378,38 +1237,171 @@ class Configuration:
         assert isinstance(new_entry, list), "Invalid entry type."
 
         try:
-            jsonschema.validate(new_entry, Configuration._schema)
-        except jsonschema.exceptions.ValidationError as err:
-            print(
-                "Invalid entry! please see `Configuration.entry_example` for the correct format."
-            )
-            raise jsonschema.exceptions.ValidationError(err)
-        except jsonschema.exceptions.SchemaError as err:
+            validate(new_entry)
+        except validation_errors():
             print(
-                "Invalid entry! please see `Configuration.entry_example` for the correct format."
+                "Invalid entry! please see `Configuration.entry_example()` for the correct format."
             )
-            raise jsonschema.exceptions.SchemaError(err)
+            raise
 
-        local_config = None
-        if os.path.isfile(Configuration._paddata[padname]):
-            local_config = Configuration(padname)
+        # the metadata may be written by another process in the meantime, in which case the
+        # entries are added to the new metadata
+        for attempt in range(3):
+            if Configuration._metadata_file(padname) is not None:
+                local_config = Configuration(padname, lazy=True)
+            else:
+                local_config = Configuration(padname, [])
 
-        if local_config is not None:
-            new_entries = []
+            new_entries, names = [], set()
             for entry in new_entry:
-                if entry["name"] in local_config.analyses:
+                if entry["name"] in local_config or entry["name"] in names:
                     print(f"{entry['name']} already exist. Please modify the data instead.")
                     continue
                 new_entries.append(entry)
-        else:
-            new_entries = new_entry
+                names.add(entry["name"])
+
+            if len(new_entries) == 0:
+                return
+            try:
+                local_config._modify(additions=new_entries, validated=True)
+                return
+            except ConflictError:
+                if attempt == 2:
+                    raise
+
+
+    @staticmethod
+    def _read_entries(source: Union[Iterable, Text]) -> Generator:
+        """
+        Iterate over JSON entries given as dictionaries, JSON lines or a NDJSON file. Yields
+        the position of the entry (line number for files) and the entry, or the error if the
+        line can not be decoded.
+        """
+        if isinstance(source, str):
+            with open(source, "r") as f:
+                yield from Configuration._read_entries(f)
+            return
+        for position, item in enumerate(source, 1):
+            if isinstance(item, str):
+                if item.strip() == "":
+                    continue
+                try:
+                    item = json.loads(item)
+                except ValueError as err:
+                    yield position, err
+                    continue
+            yield position, item
+
+
+    def import_entries(self, source: Union[Iterable, Text]) -> NamedTuple:
+        """
+        Add entries from a stream, e.g. a NDJSON file with one JSON entry per line. Entries are
+        validated and checked against the existing analyses one at a time, invalid entries
+        and already existing analyses are reported without interrupting the import. The
+        metadata is written once at the end, or at the end of the current transaction.
 
-        if local_config is not None:
-            pad_data = local_config._asdict() + new_entries
+        .. code-block:: python
+
+            config = Configuration("PAD")
+            report = config.import_entries("new_analyses.ndjson")
+            for line, name, reason in report.rejected:
+                print(line, name, reason)
+
+        Parameters
+        ----------
+        source : Union[Iterable, Text]
+            path of a NDJSON file, or an iterable of entries as dictionaries or JSON strings
+            e.g. an open file.
+
+        Returns
+        -------
+        NamedTuple
+            ``Configuration.ImportReport``: number of imported entries and
+            ``(position, name, reason)`` of the rejected ones, position being the line number
+            for files.
+
+        Raises
+        ------
+        AssertionError
+            if the configuration can not be saved.
+        ConflictError:
+            metadata has been modified since the configuration has been loaded.
+        """
+        assert self.padname in ["PAD", "PADForMA5tune", "PADForSFS"], \
+            "Only PAD, PADForMA5tune or PADForSFS configurations can be modified."
+
+        snapshot = self.pad_data.copy() if self._transaction is None else None
+        size = len(self.pad_data)
+        imported, rejected = 0, []
+        try:
+            for position, entry in Configuration._read_entries(source):
+                if isinstance(entry, Exception):
+                    rejected.append((position, None, f"invalid JSON: {entry}"))
+                    continue
+                name = entry.get("name", None) if isinstance(entry, dict) else None
+                if isinstance(name, str) and name in self._index:
+                    rejected.append((position, name, "already exists"))
+                    continue
+                try:
+                    validate([entry])
+                except validation_errors() as err:
+                    rejected.append((position, name, f"invalid entry: {err.message}"))
+                    continue
+
+                self._index[name] = len(self.pad_data)
+                if self._transaction is not None:
+                    self._transaction.add(len(self.pad_data))
+                self.pad_data.append(Configuration._make_entry(entry, self.compact))
+                imported += 1
+
+            if imported > 0:
+                self._invalidate()
+                if self._transaction is None:
+                    self._save(positions=range(size, len(self.pad_data)))
+        except BaseException:
+            if snapshot is not None:
+                self._rollback(snapshot)
+            raise
+
+        if len(rejected) > 0:
+            print(f"{len(rejected)} entries have been rejected.")
+        return Configuration.ImportReport(imported, rejected)
+
+
+    def export_entries(self, path: Text, analyses: Optional[Sequence[Text]] = None) -> int:
+        """
+        Write entries into a NDJSON file, one JSON entry per line, see ``import_entries``.
+
+        Parameters
+        ----------
+        path : Text
+            output file
+        analyses : Optional[Sequence[Text]]
+            analyses to be written, all the analyses if None.
+
+        Returns
+        -------
+        int
+            number of written entries
+
+        Raises
+        ------
+        AssertionError
+            if an analysis does not exist within current configuration
+        """
+        if analyses is None:
+            entries = iter(self)
         else:
-            pad_data = new_entries
+            for analysis in analyses:
+                assert analysis in self, f"Unknown analysis: {analysis}"
+            entries = (self.get_analysis(analysis) for analysis in analyses)
 
-        Configuration.save(padname, pad_data)
+        count = 0
+        with open(path, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(Configuration._entry_to_dict(entry)) + "\n")
+                count += 1
+        return count
 
 
     def add_json_info(self, analysis: Text, entry: Union[Sequence[Dict], Dict]) -> None:
@@ -444,32 +1436,26 @@ class Configuration:
             invalid new entry
         jsonschema.exceptions.SchemaError:
             invalid new entry
+        ConflictError:
+            metadata has been modified since the configuration has been loaded.
         """
         if isinstance(entry, dict):
             entry = [entry]
         assert isinstance(entry, list), "Unknown entry type."
-        assert analysis in list(self.keys()), f"Unknown analysis: {analysis}"
+        assert analysis in self, f"Unknown analysis: {analysis}"
 
         # Validate
         valid = []
         for ent in entry:
             if not all([x in ["name", "url"] for x in ent]):
-                print("Corrupt entry: " + ent)
+                print(f"Corrupt entry: {ent}")
                 continue
             valid.append(ent)
 
         if len(valid) > 0:
-            pad_data = self._asdict()
-            for idx, data_entry in enumerate(pad_data):
-                if data_entry["name"] == analysis:
-                    pad_data[idx]["url"]["json"] += valid
-                    break
-
-            jsonschema.validate(pad_data, Configuration._schema)
-            self.save(self.padname, pad_data)
-
-            # Reinitialize current config
-            self.__init__(self.padname)
+            new_entry = self.entry_asdict(analysis)
+            new_entry["url"]["json"] += valid
+            self._modify({self._index[analysis]: new_entry})
 
 
     def add_bibtex_info(self, analysis: Text, entry: Union[Sequence[Text], Text]):
@@ -496,37 +1482,60 @@ class Configuration:
             invalid new entry
         jsonschema.exceptions.SchemaError:
             invalid new entry
+        ConflictError:
+            metadata has been modified since the configuration has been loaded.
         """
         if isinstance(entry, str):
             entry = [entry]
         assert isinstance(entry, list), "Unknown entry type."
-        assert analysis in list(self.keys()), f"Unknown analysis: {analysis}"
+        assert analysis in self, f"Unknown analysis: {analysis}"
 
         # Validate
         valid = []
+        keys = {citation_key(x) for x in self.get_analysis(analysis).bibtex} - {None}
         for ent in entry:
             if not isinstance(ent, str):
-                print("Corrupt entry: " + ent)
+                print(f"Corrupt entry: {ent}")
+                continue
+            key = citation_key(ent)
+            if key is not None and key in keys:
+                print(f"Citation key {key} already exists in {analysis}.")
                 continue
+            keys.add(key)
             valid.append(ent)
 
         if len(valid) > 0:
-            pad_data = self._asdict()
-            for idx, data_entry in enumerate(pad_data):
-                if data_entry["name"] == analysis:
-                    pad_data[idx]["bibtex"] += valid
-                    break
+            new_entry = self.entry_asdict(analysis)
+            new_entry["bibtex"] += valid
+            self._modify({self._index[analysis]: new_entry})
 
-            jsonschema.validate(pad_data, Configuration._schema)
-            self.save(self.padname, pad_data)
 
-            # Reinitialize current config
-            self.__init__(self.padname)
+    @staticmethod
+    def stats() -> Dict[Text, Dict]:
+        """
+        Timing counters of the metadata load, validation and save phases of this process. The
+        counters are only recorded when instrumentation is enabled, by setting the
+        ``PAD_INSTRUMENT`` environment variable or with ``instrumentation.enable()``.
+
+        Returns
+        -------
+        Dict[Text, Dict]
+            number of calls, total wall time in seconds and total bytes of each phase, see
+            ``instrumentation``.
+        """
+        return instrumentation.stats()
 
 
     @staticmethod
-    @property
     def entry_example() -> Sequence[Dict]:
+        """
+        Structure of a PAD entry, see ``meta/data_structure.json``.
+
+        Returns
+        -------
+        Sequence[Dict]
+            new list with a single example entry
+        """
         return [{
             "name"         : "analysis name", "description": "analysis description", "url": {
                 "cpp"         : "location of the code",
@@ -534,7 +1543,10 @@ class Configuration:
                 "info"        : "location of the info file", "json": [{
                     "name": "name of the json extension",
                     "url" : "location of the json file for full likelihoods",
-                }], "detector": "location of the detector card",
+                }], "detector": {
+                    "name": "name of the detector card",
+                    "url" : "location of the detector card",
+                },
             }, "padversion": "PAD version of the analysis e.g. vSFS, v1.2, v1.1 etc.",
             "ma5version"   : "minimum madanalysis version required by the analysis",
             "gcc"          : "minimum c++ version required by the analysis",
@@ -542,87 +1554,401 @@ class Configuration:
         }]
 
 
-    def recast_config(self) -> Text:
+    def _detector_index(self) -> Dict[Text, Sequence[Text]]:
+        """
+        Analyses grouped by detector card, ATLAS analyses first then CMS analyses. Built once
+        and kept until the configuration is modified.
+
+        Returns
+        -------
+        Dict[Text, Sequence[Text]]
+            file name of the detector card and the analyses using it
+        """
+        if "detectors" not in self._derived:
+            detector_cards = OrderedDict()
+            for entry in chain(self.get_collaboration("atlas"), self.get_collaboration("cms")):
+                detector_cards.setdefault(self._detector_card(entry), []).append(entry.name)
+            self._derived["detectors"] = detector_cards
+        return self._derived["detectors"]
+
+
+    def _detector_card_file(self, card: Text) -> Text:
+        if self.padname in ["PAD", "PADForMA5tune"]:
+            return "delphes_card_" + card + ".tcl"
+        return "sfs_card_" + card + (self.padname == "PADForSFS") * ".ma5"
+
+
+    def _detector_card_files(self, card: Text) -> Sequence[Text]:
+        """
+        File names of a detector card within the configuration.
+        """
+        return [self._detector_card_file(card)]
+
+
+    def _detector_card(self, entry: NamedTuple) -> Text:
+        """
+        File name of the detector card of an entry.
+        """
+        return self._detector_card_file(entry.url.detector["name"])
+
+
+    def _source(self, entry: NamedTuple) -> Text:
+        """
+        Name of the PAD providing an entry.
+        """
+        return self.padname
+
+
+    def analyses_for_detector(self, card: Text) -> Sequence[Text]:
+        """
+        Analyses using a given detector card
+
+        Parameters
+        ----------
+        card : Text
+            detector card name e.g. "atlas" or its file name as written in recast_config.dat
+            e.g. "delphes_card_atlas.tcl"
+
+        Returns
+        -------
+        Sequence[Text]
+            analysis names, empty if no analysis uses the card.
+        """
+        detector_cards = self._detector_index()
+        files = [card] if card in detector_cards else self._detector_card_files(card)
+        return [analysis for name in files for analysis in detector_cards.get(name, [])]
+
+
+    def _write_recast_config(self, stream: TextIO) -> None:
+        stream.write(
+            "#             detector card             | Analyses\n"
+            "#                                       |\n"
+        )
+        for card, analysis_list in self._detector_index().items():
+            stream.write(card.ljust(40, " ") + "| " + "   ".join(analysis_list) + "\n")
+
+
+    def recast_config(self, path: Optional[Text] = None) -> Text:
         """
         Returns recast_config.dat file in str format
 
+        Parameters
+        ----------
+        path : Optional[Text]
+            if given, recast_config.dat is written directly into this file.
+
         Returns
         -------
         Text
+            content of recast_config.dat, or the path of the file if ``path`` is given.
+        """
+        if path is not None:
+            with open(path, "w") as f:
+                self._write_recast_config(f)
+            return path
+
+        buffer = io.StringIO()
+        self._write_recast_config(buffer)
+        return buffer.getvalue()
+
+
+    def artifacts(self, analysis: Text) -> Sequence[Tuple[Text, Text]]:
         """
-        def add_analysis(detector_dict, entry):
-            if entry.url.detector["name"] in list(detector_cards.keys()):
-                detector_cards.update(
-                    {
-                        entry.url.detector["name"] : \
-                            detector_cards[entry.url.detector["name"]] + [entry.name]
-                    }
+        Files of an analysis: source code, header, info file, detector card and full
+        likelihoods.
+
+        Parameters
+        ----------
+        analysis : Text
+            analysis name
+
+        Returns
+        -------
+        Sequence[Tuple[Text, Text]]
+            file name and URL of each file
+
+        Raises
+        ------
+        AssertionError
+            If analysis does not exist within current configuration
+        """
+        entry = self.get_analysis(analysis)
+        assert entry is not None, f"Unknown analysis: {analysis}"
+        return [(artifact.filename, artifact.url) for artifact in self._artifacts(entry)]
+
+
+    def _artifacts(self, entry: NamedTuple) -> Sequence[Artifact]:
+        files = [
+            Artifact("cpp", entry.name + ".cpp", entry.url.cpp),
+            Artifact("header", entry.name + ".h", entry.url.header),
+            Artifact("info", entry.name + ".info", entry.url.info),
+            Artifact("detector", self._detector_card(entry), entry.url.detector["url"]),
+        ]
+        for likelihood in entry.url.json:
+            files.append(
+                Artifact(
+                    "json", likelihood["name"].replace(os.sep, "_") + ".json", likelihood["url"]
                 )
-                [entry.url.detector["name"]].append(entry.name)
-            else:
-                detector_cards.update({entry.url.detector["name"] : [entry.name]})
+            )
+        return [artifact for artifact in files if artifact.url]
 
-        detector_cards = OrderedDict()
-        for entry in self.get_collaboration("atlas"):
-            add_analysis(detector_cards, entry)
-        for entry in self.get_collaboration("cms"):
-            add_analysis(detector_cards, entry)
 
-        txt = "#             detector card             | Analyses\n" \
-              "#                                       |\n"
+    def plan_install(
+            self, analyses: Union[Sequence[Text], Text], ma5version: Text, gcc: Union[Text, int]
+    ) -> InstallPlan:
+        """
+        Plan the installation of analyses: files to be downloaded, shared between analyses,
+        and analyses grouped by detector card and C++ standard into build jobs which can be
+        executed in parallel. Analyses requiring a newer MadAnalysis 5 version or C++ standard
+        are rejected.
 
-        for card, analysis_list in detector_cards.items():
-            card_name = "delphes_card_" if self.padname in ["PAD", "PADForMA5tune"] else "sfs_card_"
-            card_name += card + (self.padname in ["PAD", "PADForMA5tune"])*".tcl" + \
-                         (self.padname == "PADForSFS")*".ma5"
-            txt += card_name.ljust(40, " ")
-            txt += "| " + "   ".join(analysis_list) + "\n"
-        return txt
+        .. code-block:: python
 
+            plan = config.plan_install(["atlas_susy_2016_07", "cms_sus_16_048"], "v1.9.60", 11)
+            plan.rejected   # {analysis: reason}
+            for batch in plan.batches():
+                list(pool.map(run, batch))
 
-    def write_bibtex(self,filename: Text, analyses: Union[Sequence[Text], Text]) -> None:
+        Parameters
+        ----------
+        analyses : Union[Sequence[Text], Text]
+            name of the analyses one or more.
+        ma5version : Text
+            local MadAnalysis 5 version
+        gcc : Union[Text, int]
+            local C++ standard i.e. 98, 11, 14 etc.
+
+        Returns
+        -------
+        InstallPlan
+            see ``planner.InstallPlan``
+
+        Raises
+        ------
+        AssertionError
+            If analysis does not exist within current configuration
         """
-        Write bibtex file for given analyses
+        if isinstance(analyses, str):
+            analyses = [analyses]
+        for analysis in analyses:
+            assert analysis in self, f"Unknown analysis: {analysis}"
+        return plan(
+            (self.get_analysis(analysis) for analysis in analyses),
+            self._artifacts,
+            ma5version,
+            gcc,
+            source=self._source,
+        )
+
+
+    def fetch(
+            self,
+            analyses: Union[Sequence[Text], Text],
+            dest: Text,
+            workers: int = 4,
+            store: Optional[Union[Text, ContentStore]] = None,
+    ) -> Dict[Text, Sequence[Text]]:
+        """
+        Download the files of the given analyses concurrently, see ``artifacts``. Files of
+        each analysis are written in ``<dest>/<analysis>``. Downloads are kept in a content
+        addressed store, files which have already been downloaded are not requested again and
+        interrupted downloads are resumed.
 
         Parameters
         ----------
-        filename : Text
-            to where this file needs to be saved with ".bib" extension.
         analyses : Union[Sequence[Text], Text]
             name of the analyses one or more.
+        dest : Text
+            destination directory
+        workers : int
+            maximum number of concurrent downloads
+        store : Optional[Union[Text, ContentStore]]
+            store or its location. Default is the shared ``ArtifactCache``.
+
+        Returns
+        -------
+        Dict[Text, Sequence[Text]]
+            local paths of the files of each analysis
 
         Raises
         ------
         AssertionError
             If analysis does not exist within current configuration
+        pad_configuration.fetch.FetchError
+            If any of the files can not be downloaded
         """
-        with open(
-                os.path.join(Configuration._currentpath, "meta", "common_bibliography.bib"),
-                "r"
-        ) as f:
-            bibliography = f.read()
-        bibliography += "\n\n\n\n%%%%%%%%%%%%%%%%%%%\n%    Analyses    " \
-                        "%%\n%%%%%%%%%%%%%%%%%%%\n\n\n"
+        if isinstance(analyses, str):
+            analyses = [analyses]
+        paths, targets = {}, []
+        for analysis in analyses:
+            paths[analysis] = []
+            for name, url in self.artifacts(analysis):
+                paths[analysis].append(os.path.join(dest, analysis, name))
+                targets.append((url, paths[analysis][-1]))
+
+        if not isinstance(store, ContentStore):
+            store = ArtifactCache(store)
+        Downloader(store, workers=workers).fetch(targets)
+        return paths
+
+
+    def resolve_artifacts(
+            self, analysis: Text, cache: Optional[ArtifactCache] = None, workers: int = 4
+    ) -> Dict[Text, Text]:
+        """
+        Local copies of the files of an analysis, see ``artifacts``. Files which are not in the
+        cache are downloaded, cached files are used without any network access.
 
-        analysis_list = list(self.keys())
+        Parameters
+        ----------
+        analysis : Text
+            analysis name
+        cache : Optional[ArtifactCache]
+            artifact cache, default cache if None.
+        workers : int
+            maximum number of concurrent downloads
+
+        Returns
+        -------
+        Dict[Text, Text]
+            location of each URL of the analysis in the cache. Cached files should not be
+            modified.
+
+        Raises
+        ------
+        AssertionError
+            If analysis does not exist within current configuration
+        pad_configuration.fetch.FetchError
+            If any of the files can not be downloaded
+        """
+        cache = cache if cache is not None else ArtifactCache()
+        urls = [url for _, url in self.artifacts(analysis)]
+        return Downloader(cache, workers=workers).download_all(urls)
+
+
+    def _bibtex_records(
+            self, analyses: Union[Sequence[Text], Text], cache: Optional[Dict] = None
+    ) -> Generator:
+        """
+        BibTeX records of the given analyses, unknown analyses are skipped.
+        """
         if isinstance(analyses, str):
-            assert analyses in analysis_list, f"Unknown analysis: {analyses}"
-            for bib in self[analyses].bibtex:
-                bibliography += bib + "\n\n\n"
-        elif isinstance(analyses, (list, tuple)):
-            for analysis in analyses:
-                if analysis not in analysis_list:
-                    continue
-                for bib in self[analysis].bibtex:
-                    bibliography += bib + "\n\n\n"
+            analyses = [analyses]
+        cache = cache if cache is not None else {}
+        for analysis in analyses:
+            if analysis not in cache:
+                entry = self.get_analysis(analysis)
+                cache[analysis] = entry.bibtex if entry is not None else []
+            yield from cache[analysis]
+
+
+    def _bibliography_index(self) -> BibliographyIndex:
+        """
+        Parsed BibTeX records of all the entries and of the common bibliography, built on
+        first use and kept until the configuration is modified.
+        """
+        if "bibtex" not in self._derived:
+            self._derived["bibtex"] = BibliographyIndex(self.pad_data)
+        return self._derived["bibtex"]
+
+
+    def get_citation(self, key: Text) -> Optional[BibRecord]:
+        """
+        Get a BibTeX record by its citation key
+
+        Parameters
+        ----------
+        key : Text
+            citation key e.g. "Conte:2012fm"
+
+        Returns
+        -------
+        Optional[BibRecord]
+            parsed record with ``key``, ``type``, ``fields`` and the original ``text``. None if
+            no entry nor the common bibliography defines the key.
+        """
+        return self._bibliography_index().get_citation(key)
 
-        with open(filename, "w") as bib:
-            bib.write(bibliography)
+
+    def analyses_citing(self, doi: Text) -> Sequence[Text]:
+        """
+        Analyses whose bibliography contains a record with the given DOI
+
+        Parameters
+        ----------
+        doi : Text
+            DOI e.g. "10.14428/DVN/P82DKS", case insensitive
+
+        Returns
+        -------
+        Sequence[Text]
+            analysis names
+        """
+        return self._bibliography_index().analyses_citing(doi)
+
+
+    def write_bibtex(
+            self, filename: Union[Text, TextIO], analyses: Union[Sequence[Text], Text]
+    ) -> None:
+        """
+        Write bibtex file for given analyses. Records with the same citation key are only
+        written once.
+
+        Parameters
+        ----------
+        filename : Union[Text, TextIO]
+            to where this file needs to be saved with ".bib" extension, or a text stream.
+        analyses : Union[Sequence[Text], Text]
+            name of the analyses one or more.
+
+        Raises
+        ------
+        AssertionError
+            If analysis does not exist within current configuration
+        """
+        self.write_bibtex_many({filename: analyses})
+
+
+    def write_bibtex_many(
+            self, outputs: Dict[Union[Text, TextIO], Union[Sequence[Text], Text]]
+    ) -> None:
+        """
+        Write several bibtex files, e.g. one per job. Records of an analysis are retrieved only
+        once for all the files.
+
+        .. code-block:: python
+
+            config.write_bibtex_many({
+                "job1.bib": ["atlas_susy_2018_31", "cms_sus_16_048"],
+                "job2.bib": ["atlas_susy_2018_31"],
+            })
+
+        Parameters
+        ----------
+        outputs : Dict[Union[Text, TextIO], Union[Sequence[Text], Text]]
+            file names or text streams and the analyses to be written into them.
+
+        Raises
+        ------
+        AssertionError
+            If an analysis given as a single name does not exist within current configuration
+        """
+        for analyses in outputs.values():
+            if isinstance(analyses, str):
+                assert analyses in self, f"Unknown analysis: {analyses}"
+
+        records = {}
+        for output, analyses in outputs.items():
+            if isinstance(output, str):
+                with open(output, "w") as bib:
+                    write_bibliography(bib, self._bibtex_records(analyses, records))
+            else:
+                write_bibliography(output, self._bibtex_records(analyses, records))
 
 
     def __add__(self, other):
         assert isinstance(other, Configuration), "Unknown type."
-        return Configuration("combined", self.pad_data + other.pad_data)
+        return ChainedConfiguration(self, other)
 
 
     def __str__(self):
@@ -635,4 +1961,290 @@ class Configuration:
 
 
     def __repr__(self):
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
+
+class ChainedConfiguration(Configuration):
+    """
+    Combination of configurations which references the entries of its members instead of
+    copying them. Lookups use a name index built over the entire chain which is refreshed when
+    one of the members is modified. Modifications of an entry are forwarded to the member
+    configuration providing it. Entries overridden according to the policy are only available
+    through ``sources``; length, iteration, indexing and listings skip them.
+
+    Parameters
+    ----------
+    configurations : Configuration
+        configurations to be combined, in order of precedence. Chained configurations with the
+        same policy are flattened.
+    policy : Text
+        if an analysis exists in more than one configuration; "first" uses the entry of the
+        first configuration providing it, "last" the entry of the last one and "error" raises
+        an AssertionError.
+
+    Raises
+    ------
+    AssertionError:
+        unknown policy, configuration type or conflicting analyses with "error" policy.
+    """
+
+    SourcedEntry = namedtuple("SourcedEntry", ["source", "entry"])
+
+    def __init__(self, *configurations: Configuration, policy: Text = "first"):
+        assert policy in ["first", "last", "error"], f"Unknown policy: {policy}"
+        assert all(isinstance(x, Configuration) for x in configurations), "Unknown type."
+
+        self.padname = "combined"
+        self.lazy = False
+        self.compact = False
+        self.policy = policy
+        self.members = []
+        for config in configurations:
+            if isinstance(config, ChainedConfiguration) and config.policy == policy:
+                self.members += config.members
+            else:
+                self.members.append(config)
+
+        self._pad_data = ChainedEntries(self.members)
+        self._transaction = None
+        self._chain_revision = 0
+        self._revisions = None
+        self._refresh()
+
+
+    @property
+    def pad_data(self) -> ChainedEntries:
+        return self._pad_data
+
+
+    @property
+    def _index(self) -> Dict[Text, int]:
+        self._refresh()
+        return self._chain_index
+
+
+    @property
+    def _derived(self) -> Dict:
+        self._refresh()
+        return self._chain_derived
+
+
+    @_derived.setter
+    def _derived(self, value: Dict) -> None:
+        self._chain_derived = value
+
+
+    @property
+    def _revision(self) -> int:
+        # nested chains are refreshed first, modifications of their members are propagated
+        self._refresh()
+        return self._chain_revision
+
+
+    @_revision.setter
+    def _revision(self, value: int) -> None:
+        self._chain_revision = value
+
+
+    def _refresh(self) -> None:
+        """
+        Rebuild the name index if any of the members, or any member of a nested chain, has been
+        modified. Only the entries selected by the members are indexed, nested chains keep
+        their own policy.
+        """
+        revisions = tuple((id(member), member._revision) for member in self.members)
+        if revisions == self._revisions:
+            return
+
+        index, sources = {}, {}
+        names = self._names()
+        for offset, member in zip(self._pad_data._offsets(), self.members):
+            for idx in (offset + local for local in member._positions()):
+                name = names[idx]
+                sources.setdefault(name, []).append(idx)
+                if self.policy == "error":
+                    assert len(sources[name]) == 1, \
+                        f"{name} exists in more than one configuration: " + ", ".join(
+                            self._source_at(x) for x in sources[name]
+                        )
+                if self.policy == "last" or name not in index:
+                    index[name] = idx
+
+        self._chain_index = index
+        self._sources = sources
+        self._chain_derived = {}
+        self._chain_revision += 1
+        self._revisions = revisions
+
+
+    def _build_index(self) -> None:
+        self._revisions = None
+        self._refresh()
+
+
+    def _positions(self) -> Sequence[int]:
+        """
+        Positions of the entries selected by the policy, entries overridden by another member
+        are skipped.
+        """
+        if "positions" not in self._derived:
+            self._derived["positions"] = sorted(self._index.values())
+        return self._derived["positions"]
+
+
+    def _names(self) -> Sequence[Text]:
+        names = []
+        for member in self.members:
+            names += member._names()
+        return names
+
+
+    def source(self, analysis: Text) -> Optional[Text]:
+        """
+        Parameters
+        ----------
+        analysis : Text
+            analysis name
+
+        Returns
+        -------
+        Optional[Text]
+            name of the PAD providing the analysis, None if analysis does not exist.
+        """
+        idx = self._index.get(analysis, None)
+        if idx is None:
+            return None
+        return self._source_at(idx)
+
+
+    def _source_at(self, idx: int) -> Text:
+        """
+        Name of the PAD providing the entry at a given position, resolved through nested
+        chains.
+        """
+        member, local = self._pad_data.locate(idx)
+        return self.members[member]._source(self.members[member].pad_data[local])
+
+
+    def get_sourced(self, analysis: Text) -> Optional[NamedTuple]:
+        """
+        Parameters
+        ----------
+        analysis : Text
+            analysis name
+
+        Returns
+        -------
+        Optional[NamedTuple]
+            ``SourcedEntry`` with the name of the PAD providing the analysis and its metadata.
+            None if analysis does not exist.
+        """
+        idx = self._index.get(analysis, None)
+        if idx is None:
+            return None
+        return ChainedConfiguration.SourcedEntry(self._source_at(idx), self._pad_data[idx])
+
+
+    def sources(self, analysis: Text) -> Sequence[NamedTuple]:
+        """
+        Parameters
+        ----------
+        analysis : Text
+            analysis name
+
+        Returns
+        -------
+        Sequence[NamedTuple]
+            ``SourcedEntry`` for every configuration of the chain defining the analysis, in
+            order of the chain.
+        """
+        self._refresh()
+        to_return = []
+        for idx in self._sources.get(analysis, []):
+            to_return.append(
+                ChainedConfiguration.SourcedEntry(self._source_at(idx), self._pad_data[idx])
+            )
+        return to_return
+
+
+    def __len__(self) -> int:
+        return len(self._positions())
+
+
+    def __iter__(self):
+        for idx in self._positions():
+            yield self._pad_data[idx]
+
+
+    def __getitem__(self, item: Union[int, Text]) -> NamedTuple:
+        if isinstance(item, int):
+            return self._pad_data[self._positions()[item]]
+        return super().__getitem__(item)
+
+
+    def keys(self) -> Generator:
+        names = self._names()
+        return (names[idx] for idx in self._positions())
+
+
+    def _asdict(self) -> Sequence[Dict]:
+        return [Configuration._entry_to_dict(entry) for entry in self]
+
+
+    def _bibliography_index(self) -> BibliographyIndex:
+        if "bibtex" not in self._derived:
+            self._derived["bibtex"] = BibliographyIndex(self)
+        return self._derived["bibtex"]
+
+
+    def _subset(self, positions: Sequence[int]) -> "ChainedConfiguration":
+        # each member keeps its own entries so that the PAD providing them is not lost
+        per_member = OrderedDict((member, []) for member in range(len(self.members)))
+        for idx in positions:
+            member, local = self._pad_data.locate(idx)
+            per_member[member].append(local)
+        return ChainedConfiguration(
+            *(self.members[member]._subset(local) for member, local in per_member.items()),
+            policy=self.policy,
+        )
+
+
+    def _member(self, entry: NamedTuple) -> Configuration:
+        """
+        Member configuration providing an entry.
+        """
+        return self.members[self._pad_data.locate(self._index[entry.name])[0]]
+
+
+    def _source(self, entry: NamedTuple) -> Text:
+        return self._member(entry)._source(entry)
+
+
+    def _detector_card(self, entry: NamedTuple) -> Text:
+        # card files are named after the PAD providing the entry
+        return self._member(entry)._detector_card(entry)
+
+
+    def _detector_card_files(self, card: Text) -> Sequence[Text]:
+        return list(OrderedDict.fromkeys(
+            name for member in self.members for name in member._detector_card_files(card)
+        ))
+
+
+    def _artifacts(self, entry: NamedTuple) -> Sequence[Artifact]:
+        return self._member(entry)._artifacts(entry)
+
+
+    def _modify(
+            self,
+            changes: Optional[Dict[int, Dict]] = None,
+            additions: Sequence[Dict] = (),
+            validated: bool = False,
+    ) -> None:
+        assert len(additions) == 0, "Entries can not be added to a combined configuration."
+        self._check_renames(changes or {})
+        per_member = {}
+        for idx, entry in (changes or {}).items():
+            member, local = self._pad_data.locate(idx)
+            per_member.setdefault(member, {}).update({local: entry})
+        for member, member_changes in per_member.items():
+            self.members[member]._modify(member_changes, validated=validated)
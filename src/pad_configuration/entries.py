@@ -0,0 +1,359 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import threading
+from bisect import bisect_right
+from collections.abc import MutableSequence, Sequence as SequenceABC
+from typing import Callable, Dict, Generator, List, NamedTuple, Optional, Sequence, Text, Tuple
+
+
+class ReadOnlyDict(dict):
+    """
+    Dictionary which can not be modified. PAD entries are shared by all the configurations of
+    the process, hence their mappings are read-only; ``dict(x)`` gives a modifiable copy.
+    """
+
+    __slots__ = ()
+
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{self.__class__.__name__} object can not be modified")
+
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+
+class EntryStore:
+    """
+    Decoded PAD metadata. JSON entries are converted into PAD entries only when they are
+    accessed for the first time and memoised afterwards.
+
+    Parameters
+    ----------
+    raw_entries : Sequence[Dict]
+        decoded JSON entries
+    factory : Callable[[Dict], NamedTuple]
+        converts a JSON entry into a PAD entry
+    names : Optional[Sequence[Text]]
+        analysis names in the same order as the entries. If None, names are read from the
+        JSON entries.
+    stamp : Optional[Tuple]
+        identity of the metadata file the entries have been read from, see
+        ``Configuration._metadata_stamp``.
+
+    Attributes
+    ----------
+    source : Sequence[Dict]
+        raw entries as given, e.g. the reader of a binary file or a database snapshot.
+    """
+
+    def __init__(
+            self,
+            raw_entries: Sequence[Dict],
+            factory: Callable[[Dict], NamedTuple],
+            names: Optional[Sequence[Text]] = None,
+            stamp: Optional[Tuple] = None,
+    ):
+        self.stamp = stamp
+        self.source = raw_entries
+        self._raw = raw_entries if names is not None else list(raw_entries)
+        self._factory = factory
+        self._entries = [None] * len(self._raw)
+        self._lock = threading.Lock()
+        self._names = list(names) if names is not None else [x["name"] for x in self._raw]
+
+
+    @classmethod
+    def from_entries(
+            cls, entries: List[NamedTuple], stamp: Optional[Tuple] = None
+    ) -> "EntryStore":
+        """
+        Store of entries which have already been created, e.g. the entries of a configuration
+        which has just been written. The list is used as it is and the names are only read
+        when they are needed.
+        """
+        store = cls.__new__(cls)
+        store.stamp = stamp
+        store.source = store._raw = store._entries = entries
+        store._factory = None
+        store._lock = threading.Lock()
+        store._names = None
+        return store
+
+
+    @property
+    def names(self) -> List[Text]:
+        """Analysis names in the same order as the entries."""
+        if self._names is None:
+            with self._lock:
+                if self._names is None:
+                    self._names = [entry.name for entry in self._entries]
+        return self._names
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def __getitem__(self, idx: int) -> NamedTuple:
+        entry = self._entries[idx]
+        if entry is None:
+            with self._lock:
+                entry = self._entries[idx]
+                if entry is None:
+                    entry = self._factory(self._raw[idx])
+                    self._entries[idx] = entry
+                    if isinstance(self._raw, list):
+                        # JSON entry is not needed anymore
+                        self._raw[idx] = None
+        return entry
+
+
+    def raw(self, idx: int) -> Optional[Dict]:
+        """
+        JSON entry at a given position if it has not been converted into a PAD entry yet,
+        without converting it. None otherwise. The dictionary must not be modified.
+        """
+        if self._entries[idx] is not None:
+            return None
+        raw = self._raw[idx]
+        return raw if isinstance(raw, dict) else None
+
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+
+class OverlayStore(EntryStore):
+    """
+    Entries of another store with some of them replaced or added, e.g. the metadata of a
+    configuration which has just been modified. The other store is not copied, overlays of an
+    overlay refer to the original store.
+
+    Parameters
+    ----------
+    base : EntryStore
+        entries before the modification
+    changes : Dict[int, NamedTuple]
+        modified and added entries keyed by their position
+    size : int
+        number of entries, entries of ``base`` beyond are removed.
+    stamp : Optional[Tuple]
+        identity of the metadata file, see ``EntryStore``.
+    """
+
+    def __init__(
+            self,
+            base: EntryStore,
+            changes: Dict[int, NamedTuple],
+            size: int,
+            stamp: Optional[Tuple] = None,
+    ):
+        if isinstance(base, OverlayStore):
+            changes = {**base._changes, **changes}
+            base = base._base
+        self.stamp = stamp
+        # attributes stored with the base entries do not describe the modified ones
+        self.source = None
+        self._base = base
+        self._changes = {idx: entry for idx, entry in changes.items() if idx < size}
+        self._size = size
+        self._lock = threading.Lock()
+        self._names = None
+
+
+    @property
+    def names(self) -> List[Text]:
+        if self._names is None:
+            with self._lock:
+                if self._names is None:
+                    names = self._base.names[:self._size]
+                    names += [None] * (self._size - len(names))
+                    for idx, entry in self._changes.items():
+                        names[idx] = entry.name
+                    self._names = names
+        return self._names
+
+
+    def __len__(self) -> int:
+        return self._size
+
+
+    def __getitem__(self, idx: int) -> NamedTuple:
+        entry = self._changes.get(idx, None)
+        if entry is not None:
+            return entry
+        if not 0 <= idx < self._size:
+            raise IndexError("list index out of range")
+        return self._base[idx]
+
+
+    def raw(self, idx: int) -> Optional[Dict]:
+        return None if idx in self._changes else self._base.raw(idx)
+
+
+class LazyEntries(MutableSequence):
+    """
+    List of PAD entries of a single configuration backed by an ``EntryStore``. Entries are
+    fetched from the store on first access. Modifications only affect this list.
+
+    Parameters
+    ----------
+    store : EntryStore
+        shared decoded metadata
+    """
+
+    def __init__(self, store: EntryStore):
+        self._store = store
+        # an item is either the position of the entry in the store or the entry itself
+        self._items = list(range(len(store)))
+        self.names = list(store.names)
+
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        item = self._items[idx]
+        if isinstance(item, int):
+            item = self._store[item]
+            self._items[idx] = item
+        return item
+
+
+    def __setitem__(self, idx: int, entry: NamedTuple) -> None:
+        self._items[idx] = entry
+        self.names[idx] = entry.name
+
+
+    def __delitem__(self, idx: int) -> None:
+        del self._items[idx]
+        del self.names[idx]
+
+
+    def insert(self, idx: int, entry: NamedTuple) -> None:
+        self._items.insert(idx, entry)
+        self.names.insert(idx, entry.name)
+
+
+    def copy(self) -> "LazyEntries":
+        """Shallow copy sharing the same store."""
+        new = LazyEntries.__new__(LazyEntries)
+        new._store = self._store
+        new._items = list(self._items)
+        new.names = list(self.names)
+        return new
+
+
+    def entry_dicts(self, to_dict: Callable[[NamedTuple], Dict]) -> Generator:
+        """
+        JSON entries in order. Entries which have not been accessed are read from the store
+        without creating them, the others are converted by ``to_dict``. Dictionaries read
+        from the store must not be modified.
+        """
+        for item in self._items:
+            if isinstance(item, int):
+                raw = self._store.raw(item)
+                if raw is not None:
+                    yield raw
+                    continue
+                item = self._store[item]
+            yield to_dict(item)
+
+
+    @property
+    def materialised(self) -> int:
+        """Number of entries that have been converted into PAD entries."""
+        return sum(not isinstance(item, int) for item in self._items)
+
+
+class ChainedEntries(SequenceABC):
+    """
+    Read-only concatenation of the entries of several configurations, without copying them.
+
+    Parameters
+    ----------
+    members : Sequence
+        configurations whose entries are concatenated
+    """
+
+    def __init__(self, members: Sequence):
+        self._members = members
+
+
+    def _offsets(self) -> Sequence[int]:
+        offsets, total = [], 0
+        for member in self._members:
+            offsets.append(total)
+            total += len(member.pad_data)
+        return offsets
+
+
+    def __len__(self) -> int:
+        return sum(len(member.pad_data) for member in self._members)
+
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if idx < 0:
+            raise IndexError("list index out of range")
+        offsets = self._offsets()
+        member = bisect_right(offsets, idx) - 1
+        local = idx - offsets[member]
+        if member < 0 or local >= len(self._members[member].pad_data):
+            raise IndexError("list index out of range")
+        return self._members[member].pad_data[local]
+
+
+    def __iter__(self):
+        for member in self._members:
+            yield from member.pad_data
+
+
+    def locate(self, idx: int) -> Tuple[int, int]:
+        """
+        Returns
+        -------
+        Tuple[int, int]
+            position of the configuration holding the entry and position of the entry within
+            this configuration.
+        """
+        offsets = self._offsets()
+        member = bisect_right(offsets, idx) - 1
+        return member, idx - offsets[member]
+
+
+    def copy(self) -> list:
+        return list(self)
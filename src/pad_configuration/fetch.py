@@ -0,0 +1,469 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Concurrent download of the files referenced by PAD entries. Downloaded files are kept in a
+content addressed store;
+
+.. code-block:: text
+
+    <store>/objects/ab/abcdef...   file content, named after its sha256
+    <store>/urls/<sha256 of url>   sha256 of the content downloaded from the url
+    <store>/partial/<sha256 of url>.part
+                                   interrupted downloads, resumed with a Range request
+
+A URL which has already been downloaded is not requested again.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Text, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from .utils import atomic_write
+
+# http.client and concurrent.futures are imported on first download, they are comparatively
+# slow to import and not needed to read the metadata.
+
+_redirects = [301, 302, 303, 307, 308]
+_max_redirects = 10
+_chunk_size = 1 << 16
+
+
+class FetchError(OSError):
+    """Download failure."""
+
+
+def file_digest(filename: Text) -> Text:
+    """
+    Returns
+    -------
+    Text
+        sha256 of the content of the file
+    """
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(_chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ContentStore:
+    """
+    Content addressed storage of downloaded files. Stored files are read-only, they are hard
+    linked to their targets when possible (see ``checkout``), hence targets must not be
+    modified in place.
+
+    Parameters
+    ----------
+    root : Text
+        store directory, created if it does not exist.
+    """
+
+    def __init__(self, root: Text):
+        self.root = os.path.abspath(root)
+        for directory in ["objects", "urls", "partial"]:
+            os.makedirs(os.path.join(self.root, directory), exist_ok=True)
+
+
+    @staticmethod
+    def _url_key(url: Text) -> Text:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+    def object_path(self, digest: Text) -> Text:
+        """
+        Returns
+        -------
+        Text
+            location of the file with the given sha256
+        """
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+
+    def partial_path(self, url: Text) -> Text:
+        """
+        Returns
+        -------
+        Text
+            location of the incomplete download of the URL
+        """
+        return os.path.join(self.root, "partial", self._url_key(url) + ".part")
+
+
+    def lookup(self, url: Text) -> Optional[Text]:
+        """
+        Parameters
+        ----------
+        url : Text
+            file URL
+
+        Returns
+        -------
+        Optional[Text]
+            location of the stored content of the URL, None if it has not been downloaded.
+        """
+        try:
+            with open(os.path.join(self.root, "urls", self._url_key(url)), "r") as f:
+                digest = f.read().strip()
+        except OSError:
+            return None
+        path = self.object_path(digest)
+        return path if os.path.isfile(path) else None
+
+
+    def add(self, url: Text, filename: Text) -> Text:
+        """
+        Move a downloaded file into the store
+
+        Parameters
+        ----------
+        url : Text
+            URL the file has been downloaded from
+        filename : Text
+            downloaded file, moved into the store.
+
+        Returns
+        -------
+        Text
+            location of the stored file
+        """
+        digest = file_digest(filename)
+        path = self.object_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.chmod(filename, 0o444)
+        os.replace(filename, path)
+        atomic_write(os.path.join(self.root, "urls", self._url_key(url)), digest)
+        return path
+
+
+    @contextmanager
+    def lock(self, url: Text):
+        """
+        Held while the URL is downloaded. The store does not protect downloads from other
+        processes, see ``cache.ArtifactCache``.
+        """
+        yield
+
+
+    def checkout(self, path: Text, target: Text) -> None:
+        """
+        Make ``target`` a copy of the stored file ``path``, hard linked when possible, see
+        ``place``.
+        """
+        place(path, target)
+
+
+    def trim(self, keep: Iterable[Text] = ()) -> None:
+        """
+        Reduce the size of the store, files in ``keep`` are not removed. Nothing is removed
+        from a plain store.
+        """
+
+
+def place(source: Text, target: Text, link: bool = True) -> None:
+    """
+    Make ``target`` a copy of ``source``.
+
+    Parameters
+    ----------
+    source : Text
+        existing file
+    target : Text
+        copy, replaced if it exists
+    link : bool
+        hard link ``target`` to ``source`` when possible, modifying one of them modifies
+        the other. If False, the content is copied into a new writable file.
+    """
+    if link and os.path.exists(target) and os.path.samefile(source, target):
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(target)), suffix=".tmp")
+    os.close(fd)
+    try:
+        if link:
+            os.remove(tmp)
+            try:
+                os.link(source, tmp)
+            except OSError:
+                shutil.copyfile(source, tmp)
+        else:
+            shutil.copyfile(source, tmp)
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+class Downloader:
+    """
+    HTTP(S) client downloading files concurrently. Each worker thread keeps one connection
+    per host which is reused for all of its requests.
+
+    Parameters
+    ----------
+    store : ContentStore
+        where downloaded files are kept
+    workers : int
+        maximum number of concurrent downloads
+    timeout : float
+        socket timeout in seconds
+    """
+
+    def __init__(self, store: ContentStore, workers: int = 4, timeout: float = 60.0):
+        assert workers > 0, "At least one worker is required."
+        self.store = store
+        self.workers = workers
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+
+    def _connection(self, scheme: Text, netloc: Text) -> "http.client.HTTPConnection":
+        import http.client
+
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        if (scheme, netloc) not in connections:
+            assert scheme in ["http", "https"], f"Unsupported URL scheme: {scheme}"
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            connection = cls(netloc, timeout=self.timeout)
+            connections[(scheme, netloc)] = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connections[(scheme, netloc)]
+
+
+    def _request(self, url: Text, headers: Dict[Text, Text]) -> "http.client.HTTPResponse":
+        """
+        GET request following redirections. The response body has to be consumed before the
+        next request.
+        """
+        import http.client
+
+        for _ in range(_max_redirects):
+            parts = urlsplit(url)
+            path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+            connection = self._connection(parts.scheme, parts.netloc)
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+            except (http.client.HTTPException, ConnectionError):
+                # the server may have closed an idle connection, retry once on a new one
+                connection.close()
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+
+            if response.status in _redirects:
+                response.read()
+                url = urljoin(url, response.getheader("Location", ""))
+                continue
+            return response
+
+        raise FetchError(f"Too many redirections: {url}")
+
+
+    def download(self, url: Text) -> Text:
+        """
+        Download a file into the store unless it is already available. Interrupted downloads
+        are resumed.
+
+        Parameters
+        ----------
+        url : Text
+            file URL
+
+        Returns
+        -------
+        Text
+            location of the file in the store
+
+        Raises
+        ------
+        FetchError
+            if the server does not deliver the file
+        """
+        stored = self.store.lookup(url)
+        if stored is not None:
+            return stored
+
+        with self.store.lock(url):
+            # the URL may have been downloaded while waiting for the lock
+            stored = self.store.lookup(url)
+            if stored is not None:
+                return stored
+            return self._download(url)
+
+
+    def _download(self, url: Text) -> Text:
+        import http.client
+
+        partial = self.store.partial_path(url)
+        for _ in range(2):
+            offset = os.path.getsize(partial) if os.path.isfile(partial) else 0
+            headers = {"Accept-Encoding": "identity"}
+            if offset > 0:
+                headers.update({"Range": f"bytes={offset}-"})
+            response = self._request(url, headers)
+
+            if response.status == 416:
+                response.read()
+                total = re.match(r"bytes \*/(\d+)", response.getheader("Content-Range", ""))
+                if total is not None and int(total.group(1)) == offset:
+                    return self.store.add(url, partial)
+                # partial file does not belong to the current content
+                os.remove(partial)
+                continue
+
+            if response.status not in [200, 206]:
+                response.read()
+                raise FetchError(f"{url}: HTTP {response.status} {response.reason}")
+
+            start, expected = 0, response.getheader("Content-Length", None)
+            expected = int(expected) if expected is not None else None
+            if response.status == 206:
+                match = re.match(
+                    r"bytes (\d+)-(\d+)/(\d+|\*)", response.getheader("Content-Range", "")
+                )
+                if match is None:
+                    response.read()
+                    raise FetchError(f"{url}: invalid Content-Range in partial response")
+                start = int(match.group(1))
+                expected = int(match.group(3)) if match.group(3) != "*" else \
+                    int(match.group(2)) + 1
+
+            with open(partial, "r+b" if os.path.isfile(partial) else "wb") as f:
+                f.seek(start)
+                f.truncate()
+                try:
+                    for chunk in iter(lambda: response.read(_chunk_size), b""):
+                        f.write(chunk)
+                except (http.client.HTTPException, OSError) as err:
+                    raise FetchError(f"{url}: transfer interrupted ({err})") from err
+                size = f.tell()
+            if expected is not None and size != expected:
+                # the incomplete file is kept and resumed by the next download
+                response.close()
+                raise FetchError(f"{url}: incomplete transfer, {size} of {expected} bytes")
+            return self.store.add(url, partial)
+
+        raise FetchError(f"Unable to resume the download of {url}")
+
+
+    def _download_all(self, urls: Iterable[Text]) -> Tuple[Dict[Text, Text], List[Text]]:
+        from concurrent.futures import ThreadPoolExecutor
+
+        urls = list(dict.fromkeys(urls))
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {url: executor.submit(self.download, url) for url in urls}
+        finally:
+            self.close()
+
+        paths, errors = {}, []
+        for url, future in futures.items():
+            if future.exception() is not None:
+                errors.append(str(future.exception()))
+            else:
+                paths[url] = future.result()
+        return paths, errors
+
+
+    @staticmethod
+    def _raise(errors: Sequence[Text]) -> None:
+        if len(errors) > 0:
+            raise FetchError("Unable to download:\n   " + "\n   ".join(errors))
+
+
+    def download_all(self, urls: Iterable[Text]) -> Dict[Text, Text]:
+        """
+        Download files concurrently into the store
+
+        Parameters
+        ----------
+        urls : Iterable[Text]
+            file URLs
+
+        Returns
+        -------
+        Dict[Text, Text]
+            location of each file in the store
+
+        Raises
+        ------
+        FetchError
+            if any of the downloads failed, after all the others are completed.
+        """
+        paths, errors = self._download_all(urls)
+        self.store.trim(keep=paths.values())
+        self._raise(errors)
+        return paths
+
+
+    def fetch(self, targets: Sequence[Tuple[Text, Text]]) -> None:
+        """
+        Download files concurrently and place them at their targets. Each URL is downloaded
+        only once even if it has several targets.
+
+        Parameters
+        ----------
+        targets : Sequence[Tuple[Text, Text]]
+            URL and local path of each file
+
+        Raises
+        ------
+        FetchError
+            if any of the downloads failed, after all the others are completed.
+        """
+        paths, errors = self._download_all(url for url, _ in targets)
+        try:
+            for url, target in targets:
+                if url not in paths:
+                    continue
+                try:
+                    self.store.checkout(paths[url], target)
+                except FileNotFoundError:
+                    # removed from the store by another process in the meantime
+                    paths[url] = self.download(url)
+                    self.store.checkout(paths[url], target)
+        finally:
+            self.close()
+        self.store.trim(keep=paths.values())
+        self._raise(errors)
+
+
+    def close(self) -> None:
+        """Close all the connections."""
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
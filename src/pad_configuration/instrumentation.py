@@ -0,0 +1,204 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Opt-in timing counters of the metadata load, validation and save phases. Instrumentation is
+enabled by setting the ``PAD_INSTRUMENT`` environment variable to a non-empty value other than
+"0", or with ``enable()``. When it is disabled, ``phase`` returns a shared no-op context and
+nothing is recorded.
+
+.. code-block:: python
+
+    from pad_configuration import Configuration, instrumentation
+
+    instrumentation.enable()
+    instrumentation.add_hook(lambda name, seconds, nbytes: statsd.timing(name, seconds))
+    config = Configuration("PAD")
+    Configuration.stats()   # {"load.read": {"calls": 1, "seconds": ..., "bytes": ...}, ...}
+
+Phases
+------
+load               reading and decoding a metadata file, cached loads are not included
+load.cache_hit     metadata shared with a previous configuration, no time is recorded
+load.read          reading the metadata file, bytes read
+load.base64        base64 decoding of a compressed file, decoded bytes
+load.decompress    decompression, decompressed bytes
+load.json          JSON parsing
+load.entries       creation of the PAD entries, lazy configurations create them on access
+validate           validation of PAD entries, bytes is the number of entries
+save               writing a metadata file, bytes written
+save.json          JSON serialisation, bytes of JSON
+save.compress      compression, compressed bytes
+save.base64        base64 encoding, encoded bytes
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Text
+
+# Callable[[name, seconds, bytes], None]
+Hook = Callable[[Text, float, int], None]
+
+enabled = os.environ.get("PAD_INSTRUMENT", "") not in ["", "0"]
+
+_stats = {}
+_hooks = []
+_lock = threading.Lock()
+
+
+class _Phase:
+    """Measures the wall time of a phase, bytes can be set within the context."""
+
+    __slots__ = ("name", "bytes", "_start")
+
+    def __init__(self, name: Text, nbytes: int):
+        self.name = name
+        self.bytes = nbytes
+
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+
+    def __exit__(self, *exc_info):
+        record(self.name, time.perf_counter() - self._start, self.bytes)
+
+
+class _Disabled:
+    """No-op phase, assignments are ignored."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_disabled = _Disabled()
+
+
+def phase(name: Text, nbytes: int = 0):
+    """
+    Context measuring the wall time of a phase.
+
+    .. code-block:: python
+
+        with instrumentation.phase("load.read") as current:
+            data = f.read()
+            current.bytes = len(data)
+
+    Parameters
+    ----------
+    name : Text
+        name of the phase
+    nbytes : int
+        bytes processed, can also be set within the context.
+    """
+    if not enabled:
+        return _disabled
+    return _Phase(name, nbytes)
+
+
+def record(name: Text, seconds: float = 0.0, nbytes: int = 0) -> None:
+    """
+    Record a call of a phase and forward it to the hooks.
+
+    Parameters
+    ----------
+    name : Text
+        name of the phase
+    seconds : float
+        wall time
+    nbytes : int
+        bytes processed
+    """
+    if not enabled:
+        return
+    with _lock:
+        counters = _stats.setdefault(name, [0, 0.0, 0])
+        counters[0] += 1
+        counters[1] += seconds
+        counters[2] += nbytes
+        hooks = list(_hooks)
+    for hook in hooks:
+        try:
+            hook(name, seconds, nbytes)
+        except Exception as err:
+            print(f"Instrumentation hook {hook} failed: {err}")
+
+
+def stats() -> Dict[Text, Dict]:
+    """
+    Returns
+    -------
+    Dict[Text, Dict]
+        snapshot of the counters of each phase: number of calls, total wall time in seconds
+        and total bytes.
+    """
+    with _lock:
+        return {
+            name: {"calls": calls, "seconds": seconds, "bytes": nbytes}
+            for name, (calls, seconds, nbytes) in sorted(_stats.items())
+        }
+
+
+def reset() -> None:
+    """Reset the counters."""
+    with _lock:
+        _stats.clear()
+
+
+def enable() -> None:
+    """Start recording."""
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    """Stop recording, counters are kept."""
+    global enabled
+    enabled = False
+
+
+def add_hook(hook: Hook) -> None:
+    """
+    Call ``hook(name, seconds, nbytes)`` at the end of each recorded phase, e.g. to forward the
+    timings to a metrics system. Exceptions raised by hooks are reported and ignored.
+    """
+    with _lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    with _lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
@@ -0,0 +1,299 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Differences between two versions of PAD metadata. A patch lists the removed analyses, the added
+entries and, for modified entries, the new value of each modified field. Nested dictionaries
+(``url``, ``url.detector``) are compared field by field; lists are replaced as a whole.
+
+.. code-block:: python
+
+    {
+        "version": 1,
+        "base": "<sha256 of the original metadata>",
+        "result": "<sha256 of the patched metadata>",
+        "removed": ["analysis", ...],
+        "added": [{entry}, ...],
+        "changed": {"analysis": {"bibtex": [...], "url.detector.url": "..."}, ...},
+        "unset": {"analysis": ["field", ...], ...},
+        "order": ["analysis", ...],
+    }
+
+``order`` is only given if the analyses are not in the order obtained by removing the removed
+analyses and appending the added ones. Patches are written as compressed JSON, see ``dumps``.
+"""
+
+import base64
+import copy
+import hashlib
+import json
+import re
+from typing import Dict, Sequence, Text, Tuple
+
+from .utils import atomic_write, get_codec
+
+_version = 1
+_header = "# Ma5 - PAD patch"
+
+
+class PatchError(RuntimeError):
+    """Patch does not apply to the metadata, or does not produce the expected metadata."""
+
+
+def digest(entries: Sequence[Dict]) -> Text:
+    """
+    Returns
+    -------
+    Text
+        sha256 of the canonical JSON serialisation of the entries, independent of the order of
+        the keys of the entries.
+    """
+    return hashlib.sha256(
+        json.dumps(entries, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+def _field_changes(old: Dict, new: Dict, prefix: Text = "") -> Tuple[Dict, Sequence[Text]]:
+    changed, unset = {}, []
+    for key, value in new.items():
+        path = prefix + key
+        if key not in old:
+            changed[path] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            nested_changed, nested_unset = _field_changes(old[key], value, path + ".")
+            changed.update(nested_changed)
+            unset += nested_unset
+        elif old[key] != value:
+            changed[path] = value
+    unset += [prefix + key for key in old if key not in new]
+    return changed, unset
+
+
+def diff(old: Sequence[Dict], new: Sequence[Dict]) -> Dict:
+    """
+    Compute the patch transforming one version of the metadata into another.
+
+    Parameters
+    ----------
+    old : Sequence[Dict]
+        original PAD entries
+    new : Sequence[Dict]
+        modified PAD entries
+
+    Returns
+    -------
+    Dict
+        patch, see module documentation
+    """
+    old_entries = {entry["name"]: entry for entry in old}
+    new_names = [entry["name"] for entry in new]
+    assert len(old_entries) == len(old) and len(set(new_names)) == len(new), \
+        "Analysis names are not unique."
+
+    patch = {
+        "version": _version,
+        "base": digest(old),
+        "result": digest(new),
+        "removed": [name for name in old_entries if name not in set(new_names)],
+        "added": [],
+        "changed": {},
+        "unset": {},
+    }
+    for entry in new:
+        previous = old_entries.get(entry["name"], None)
+        if previous is None:
+            patch["added"].append(entry)
+            continue
+        changed, unset = _field_changes(previous, entry)
+        if changed:
+            patch["changed"][entry["name"]] = changed
+        if unset:
+            patch["unset"][entry["name"]] = unset
+
+    removed = set(patch["removed"])
+    expected = [name for name in old_entries if name not in removed] + \
+               [entry["name"] for entry in patch["added"]]
+    if expected != new_names:
+        patch["order"] = new_names
+    return patch
+
+
+def is_empty(patch: Dict) -> bool:
+    """
+    Returns
+    -------
+    bool
+        True if the patch does not modify the metadata.
+    """
+    return patch["base"] == patch["result"]
+
+
+def patch_entry(entry: Dict, changed: Dict, unset: Sequence[Text] = ()) -> Dict:
+    """
+    Apply field changes to a copy of an entry.
+
+    Parameters
+    ----------
+    entry : Dict
+        PAD entry
+    changed : Dict
+        new values keyed by dotted field path e.g. ``"url.detector.url"``
+    unset : Sequence[Text]
+        dotted paths of the fields to be removed
+
+    Returns
+    -------
+    Dict
+        modified entry, the original entry is not modified.
+    """
+    entry = copy.deepcopy(entry)
+    for path, value in changed.items():
+        *parents, key = path.split(".")
+        target = entry
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = value
+    for path in unset:
+        *parents, key = path.split(".")
+        target = entry
+        for parent in parents:
+            target = target[parent]
+        del target[key]
+    return entry
+
+
+def check(patch: Dict) -> None:
+    """
+    Raises
+    ------
+    PatchError
+        if the patch is malformed or has an unsupported version.
+    """
+    if not isinstance(patch, dict) or patch.get("version", None) != _version:
+        raise PatchError("Unsupported patch format.")
+    missing = [x for x in ["base", "result", "removed", "added", "changed", "unset"]
+               if x not in patch]
+    if missing:
+        raise PatchError(f"Malformed patch, missing: {', '.join(missing)}")
+
+
+def apply(entries: Sequence[Dict], patch: Dict, verify: bool = True) -> Sequence[Dict]:
+    """
+    Apply a patch to PAD entries.
+
+    Parameters
+    ----------
+    entries : Sequence[Dict]
+        PAD entries, not modified
+    patch : Dict
+        patch computed by ``diff``
+    verify : bool
+        check the sha256 of the entries before and after applying the patch
+
+    Returns
+    -------
+    Sequence[Dict]
+        patched entries, unmodified entries are shared with the input.
+
+    Raises
+    ------
+    PatchError
+        if the patch does not apply to the entries or does not produce the expected entries.
+    """
+    check(patch)
+    if verify and digest(entries) != patch["base"]:
+        raise PatchError("Patch does not apply to this version of the metadata.")
+
+    removed = set(patch["removed"])
+    output = []
+    for entry in entries:
+        name = entry["name"]
+        if name in removed:
+            continue
+        if name in patch["changed"] or name in patch["unset"]:
+            entry = patch_entry(
+                entry, patch["changed"].get(name, {}), patch["unset"].get(name, [])
+            )
+        output.append(entry)
+    output += patch["added"]
+
+    if "order" in patch:
+        position = {name: idx for idx, name in enumerate(patch["order"])}
+        if set(position) != {entry["name"] for entry in output}:
+            raise PatchError("Patch does not apply to this version of the metadata.")
+        output.sort(key=lambda entry: position[entry["name"]])
+
+    if verify and digest(output) != patch["result"]:
+        raise PatchError("Patched metadata does not match the expected metadata.")
+    return output
+
+
+def dumps(patch: Dict, codec: Text = "zlib") -> Text:
+    """
+    Serialise a patch: a header line with the codec followed by the base64 encoded,
+    compressed JSON of the patch.
+
+    Parameters
+    ----------
+    patch : Dict
+        patch computed by ``diff``
+    codec : Text
+        compression codec, see ``utils.register_codec``
+    """
+    compress, _ = get_codec(codec)
+    data = compress(json.dumps(patch, separators=(",", ":")).encode("utf-8"))
+    return f"{_header} {patch['base'][:12]} -> {patch['result'][:12]} [codec: {codec}]\n" + \
+        base64.b64encode(data).decode("ascii")
+
+
+def loads(text: Text) -> Dict:
+    """
+    Read a patch serialised by ``dumps``.
+
+    Raises
+    ------
+    PatchError
+        if the patch can not be decoded
+    """
+    header, _, data = text.partition("\n")
+    codec = re.search(r"\[codec: ([\w\-]+)\]\s*$", header)
+    if not header.startswith(_header) or codec is None:
+        raise PatchError("Unknown patch format.")
+    _, decompress = get_codec(codec.group(1))
+    try:
+        patch = json.loads(decompress(base64.b64decode(data)))
+    except Exception:
+        raise PatchError("Could not decode the patch.")
+    check(patch)
+    return patch
+
+
+def write_patch(filename: Text, patch: Dict, codec: Text = "zlib") -> None:
+    """Write a patch into a file, see ``dumps``."""
+    atomic_write(filename, dumps(patch, codec))
+
+
+def read_patch(filename: Text) -> Dict:
+    """Read a patch file written by ``write_patch``."""
+    with open(filename, "r") as f:
+        return loads(f.read())
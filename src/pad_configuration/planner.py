@@ -0,0 +1,206 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+from collections import namedtuple, OrderedDict
+from typing import (
+    Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Text, Union
+)
+
+from .utils import cpp_standard_key, version_key
+
+# File required by an analysis; kind is "cpp", "header", "info", "detector" or "json"
+Artifact = namedtuple("Artifact", ["kind", "filename", "url"])
+# Analyses compiled together: same PAD, same detector card and same minimum C++ standard
+BuildJob = namedtuple("BuildJob", ["pad", "detector", "gcc", "analyses", "artifacts"])
+
+
+class InstallPlan:
+    """
+    Installation plan of a set of analyses, see ``plan``. Artifacts are identified by their
+    URL and shared by all the analyses requiring them.
+
+    Attributes
+    ----------
+    analyses : List[Text]
+        analyses to be installed
+    rejected : Dict[Text, Text]
+        analyses which can not be installed and the reason
+    artifacts : Dict[Text, Artifact]
+        files to be downloaded, keyed by URL
+    requires : Dict[Text, List[Text]]
+        URLs of the artifacts required by each analysis
+    jobs : List[BuildJob]
+        analyses grouped by PAD, detector card and C++ standard, largest jobs first
+    """
+
+    def __init__(self, ma5version: Text, gcc: Union[Text, int]):
+        self.ma5version = ma5version
+        self.gcc = gcc
+        self.analyses = []
+        self.rejected = OrderedDict()
+        self.artifacts = OrderedDict()
+        self.requires = OrderedDict()
+        self.jobs = []
+        self._users = {}
+
+
+    def users(self, url: Text) -> List[Text]:
+        """
+        Returns
+        -------
+        List[Text]
+            analyses requiring the artifact
+        """
+        return list(self._users.get(url, []))
+
+
+    def shared(self) -> List[Artifact]:
+        """
+        Returns
+        -------
+        List[Artifact]
+            artifacts required by more than one analysis, downloaded only once.
+        """
+        return [self.artifacts[url] for url, users in self._users.items() if len(users) > 1]
+
+
+    def graph(self) -> Dict[Text, Set[Text]]:
+        """
+        Dependency graph of the installation. Nodes are build jobs, named
+        ``"<pad>/<detector>/c++<gcc>"``, analyses and artifact URLs; build jobs depend on their
+        analyses which depend on their artifacts.
+
+        Returns
+        -------
+        Dict[Text, Set[Text]]
+            dependencies of each node, artifacts have no dependencies.
+        """
+        graph = {url: set() for url in self.artifacts}
+        for analysis, urls in self.requires.items():
+            graph[analysis] = set(urls)
+        for job in self.jobs:
+            graph[f"{job.pad}/{job.detector}/c++{job.gcc}"] = set(job.analyses)
+        return graph
+
+
+    def batches(self) -> List[List]:
+        """
+        Steps of the installation, the tasks of a step are independent and can be executed in
+        parallel e.g. by a process pool. The first step downloads the artifacts, the second one
+        builds the jobs. Empty steps are omitted.
+
+        .. code-block:: python
+
+            for batch in plan.batches():
+                list(pool.map(run, batch))
+
+        Returns
+        -------
+        List[List]
+            ``Artifact`` to be downloaded, then ``BuildJob`` to be built.
+        """
+        return [batch for batch in [list(self.artifacts.values()), list(self.jobs)] if batch]
+
+
+    def __repr__(self) -> Text:
+        return (
+            f"InstallPlan({len(self.analyses)} analyses, {len(self.rejected)} rejected, "
+            f"{len(self.artifacts)} artifacts, {len(self.jobs)} build jobs)"
+        )
+
+
+def plan(
+        entries: Iterable[NamedTuple],
+        artifacts: Callable[[NamedTuple], Sequence[Artifact]],
+        ma5version: Text,
+        gcc: Union[Text, int],
+        source: Optional[Callable[[NamedTuple], Text]] = None,
+) -> InstallPlan:
+    """
+    Plan the installation of analyses with a given MadAnalysis 5 version and C++ standard.
+
+    Parameters
+    ----------
+    entries : Iterable[NamedTuple]
+        PAD entries
+    artifacts : Callable[[NamedTuple], Sequence[Artifact]]
+        artifacts of an entry, only called for the entries which can be installed.
+    ma5version : Text
+        local MadAnalysis 5 version
+    gcc : Union[Text, int]
+        local C++ standard i.e. 98, 11, 14 etc.
+    source : Optional[Callable[[NamedTuple], Text]]
+        name of the PAD providing an entry. Detector cards of different PADs share their
+        names, hence analyses of different PADs are never built together.
+
+    Returns
+    -------
+    InstallPlan
+    """
+    installation = InstallPlan(ma5version, gcc)
+    local_version, local_cpp = version_key(ma5version), cpp_standard_key(gcc)
+    jobs = OrderedDict()
+    # entries share a handful of versions, parse each of them once
+    versions, standards = {}, {}
+
+    for entry in entries:
+        if entry.name in installation.requires or entry.name in installation.rejected:
+            continue
+        if entry.ma5version not in versions:
+            versions[entry.ma5version] = version_key(entry.ma5version)
+        if entry.gcc not in standards:
+            standards[entry.gcc] = cpp_standard_key(entry.gcc)
+
+        if versions[entry.ma5version] > local_version:
+            installation.rejected[entry.name] = f"requires MadAnalysis 5 {entry.ma5version}"
+            continue
+        if standards[entry.gcc] > local_cpp:
+            installation.rejected[entry.name] = f"requires C++{entry.gcc}"
+            continue
+
+        installation.analyses.append(entry.name)
+        installation.requires[entry.name] = []
+        required = artifacts(entry)
+        for artifact in required:
+            installation.artifacts.setdefault(artifact.url, artifact)
+            installation.requires[entry.name].append(artifact.url)
+            installation._users.setdefault(artifact.url, []).append(entry.name)
+
+        pad = source(entry) if source is not None else None
+        job = jobs.setdefault(
+            (pad, entry.url.detector["name"], entry.gcc), ([], OrderedDict())
+        )
+        job[0].append(entry.name)
+        for artifact in required:
+            job[1].setdefault(artifact.url, artifact)
+
+    installation.jobs = sorted(
+        (
+            BuildJob(pad, detector, gcc_version, analyses, list(files.values()))
+            for (pad, detector, gcc_version), (analyses, files) in jobs.items()
+        ),
+        # longest jobs first to balance the load of the workers
+        key=lambda job: len(job.analyses),
+        reverse=True,
+    )
+    return installation
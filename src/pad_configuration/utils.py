@@ -21,30 +21,244 @@
 #
 ################################################################################
 
-import base64, json, zlib, datetime
+import base64, bz2, json, lzma, os, re, tempfile, zlib, datetime
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Union, Sequence, Text, Tuple
 
-from typing import Dict, Union, Sequence
+from . import instrumentation
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
-def json_zip(json_input: Union[Dict, Sequence[Dict]]) -> Dict:
+# Compression codecs {name : (compress, decompress)}
+_codecs = {}
+
+
+def register_codec(
+        name: Text, compress: Callable[[bytes], bytes], decompress: Callable[[bytes], bytes]
+) -> None:
+    """
+    Register a compression codec for the metadata files
+
+    Parameters
+    ----------
+    name : Text
+        name of the codec, stored in the metadata files
+    compress : Callable[[bytes], bytes]
+        compression function
+    decompress : Callable[[bytes], bytes]
+        decompression function
+    """
+    assert re.fullmatch(r"[\w\-]+", name), f"Invalid codec name: {name}"
+    _codecs.update({name: (compress, decompress)})
+
+
+def get_codec(name: Text) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """
+    Parameters
+    ----------
+    name : Text
+        name of the codec
+
+    Returns
+    -------
+    Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+        compression and decompression functions
+
+    Raises
+    ------
+    AssertionError
+        Unknown codec
+    """
+    assert name in _codecs, f"Unknown codec: {name}. Available codecs: {', '.join(_codecs)}"
+    return _codecs[name]
+
+
+register_codec("zlib", zlib.compress, zlib.decompress)
+register_codec("bz2", bz2.compress, bz2.decompress)
+register_codec("lzma", lzma.compress, lzma.decompress)
+register_codec("none", bytes, bytes)
+
+
+def version_key(version: Text) -> int:
+    """
+    Pack a version string into an integer which preserves the version ordering i.e.
+    ``version_key("v1.9.60") < version_key("v1.10")``. Up to three components of 16 bits each
+    are used, missing components are zero.
+
+    Parameters
+    ----------
+    version : Text
+        version e.g. "v1.9.60" or "1.10"
+
+    Returns
+    -------
+    int
+
+    Raises
+    ------
+    AssertionError
+        if the version can not be interpreted
+    """
+    components = re.findall(r"\d+", version)
+    assert len(components) > 0, f"Unknown version: {version}"
+    components = [min(int(x), 0xFFFF) for x in components[:3]]
+    components += [0] * (3 - len(components))
+    return (components[0] << 32) | (components[1] << 16) | components[2]
+
+
+def cpp_standard_key(gcc: Union[Text, int]) -> int:
+    """
+    Order C++ standards given as two digit years i.e. 98 < 03 < 11 < 14 < 17.
+
+    Parameters
+    ----------
+    gcc : Union[Text, int]
+        C++ standard e.g. 98, "11"
+
+    Returns
+    -------
+    int
+        year of the standard
+    """
+    gcc = int(gcc)
+    if gcc >= 100:
+        return gcc
+    return 1900 + gcc if gcc >= 90 else 2000 + gcc
+
+
+def parse_description(description: Text) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Read centre-of-mass energy and integrated luminosity from an analysis description e.g.
+    "ATLAS - 13 TeV - Multi-jet + met (2-6 jets, 3.2/fb)".
+
+    Parameters
+    ----------
+    description : Text
+        analysis description
+
+    Returns
+    -------
+    Tuple[Optional[float], Optional[float]]
+        sqrt(s) in TeV and integrated luminosity in fb^-1, None if they can not be found.
+    """
+    sqrt_s = re.search(r"(\d+(?:\.\d+)?)\s*TeV", description)
+    lumi = re.findall(r"(\d+(?:\.\d+)?)\s*/\s*fb", description)
+    return (
+        float(sqrt_s.group(1)) if sqrt_s is not None else None,
+        float(lumi[-1]) if len(lumi) > 0 else None,
+    )
+
+
+def atomic_write(filename: Text, data: Union[Text, bytes], durable: bool = True) -> None:
+    """
+    Write a file by replacing it with a completely written temporary file. Readers, including
+    the ones which memory mapped the previous file, never see a partially written file. The
+    content is flushed to disk before the file is replaced, hence after a crash the file is
+    either the previous or the new one.
+
+    Parameters
+    ----------
+    filename : Text
+        file to be written
+    data : Union[Text, bytes]
+        content of the file
+    durable : bool
+        flush the content to disk. Caches which can be rebuilt skip it.
+    """
+    directory, name = os.path.split(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp, os.stat(filename).st_mode & 0o777 if os.path.isfile(filename) else 0o644)
+        os.replace(tmp, filename)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    if durable:
+        _fsync_directory(directory)
+
+
+def _fsync_directory(directory: Text) -> None:
+    """Persist the entries of a directory e.g. after a rename, where it is supported."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def file_lock(filename: Text, shared: bool = False):
+    """
+    Advisory lock on a file, shared between processes. The file is created if it does not
+    exist. On platforms without ``fcntl`` no lock is taken.
+
+    .. code-block:: python
+
+        with file_lock("/path/to/.lock"):
+            ...
+
+    Parameters
+    ----------
+    filename : Text
+        lock file
+    shared : bool
+        if True, several processes can hold the lock at the same time but not with an
+        exclusive lock.
+    """
+    with open(filename, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def json_zip(json_input: Union[Dict, Sequence[Dict]], codec: Text = "zlib") -> Dict:
     """
     Compress JSON input
 
     Parameters
     ----------
     json_input : Union[Dict, Sequence[Dict]]
+    codec : Text
+        name of the compression codec
 
     Returns
     -------
     Dict:
         Compressed input
     """
-    json_output = base64.b64encode(
-        zlib.compress(json.dumps(json_input).encode('utf-8'))
-    ).decode('ascii')
+    compress, _ = get_codec(codec)
+    with instrumentation.phase("save.json") as current:
+        json_output = json.dumps(json_input).encode('utf-8')
+        current.bytes = len(json_output)
+    with instrumentation.phase("save.compress") as current:
+        json_output = compress(json_output)
+        current.bytes = len(json_output)
+    with instrumentation.phase("save.base64") as current:
+        json_output = base64.b64encode(json_output).decode('ascii')
+        current.bytes = len(json_output)
 
     time = datetime.datetime.now().astimezone().strftime("%B %d, %Y - %H:%M:%S %Z")
-    return f"# Ma5 - PAD metadata created on {time}\n" + json_output
+    # zlib files are kept identical to the files created before the codec registry
+    codec_info = f" [codec: {codec}]" if codec != "zlib" else ""
+    return f"# Ma5 - PAD metadata created on {time}{codec_info}\n" + json_output
 
 
 def json_unzip(json_input, insist: bool = True) -> Dict:
@@ -69,13 +283,22 @@ def json_unzip(json_input, insist: bool = True) -> Dict:
     """
     assert json_input[0].startswith("# Ma5 - PAD metadata created on"), "Unknown entry."
 
+    codec = re.search(r"\[codec: ([\w\-]+)\]\s*$", json_input[0])
+    _, decompress = get_codec(codec.group(1) if codec is not None else "zlib")
+
     try:
-        json_input = zlib.decompress(base64.b64decode(json_input[1]))
+        with instrumentation.phase("load.base64") as current:
+            json_input = base64.b64decode(json_input[1])
+            current.bytes = len(json_input)
+        with instrumentation.phase("load.decompress") as current:
+            json_input = decompress(json_input)
+            current.bytes = len(json_input)
     except:
         raise RuntimeError("Could not decode/unzip the contents")
 
     try:
-        json_input = json.loads(json_input)
+        with instrumentation.phase("load.json"):
+            json_input = json.loads(json_input)
     except:
         raise RuntimeError("Could not interpret the unzipped contents")
 
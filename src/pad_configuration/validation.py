@@ -0,0 +1,238 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Type
+
+from . import instrumentation
+
+_schema_file = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "meta", "data_structure.json"
+)
+_lock = threading.Lock()
+_schema = None
+_validator = None
+_checker = None
+
+# Keywords that do not constrain the instance
+_annotations = [
+    "$id", "$schema", "$comment", "title", "description", "default", "examples",
+    "additionalItems",  # only meaningful if items is a list of schemas
+]
+
+_types = {
+    "string" : lambda x: isinstance(x, str),
+    "object" : lambda x: isinstance(x, dict),
+    "array"  : lambda x: isinstance(x, list),
+    "boolean": lambda x: isinstance(x, bool),
+    "null"   : lambda x: x is None,
+    "number" : lambda x: isinstance(x, (int, float)) and not isinstance(x, bool),
+    "integer": lambda x: (isinstance(x, int) and not isinstance(x, bool)) or
+                         (isinstance(x, float) and x.is_integer()),
+}
+
+
+def get_schema() -> Dict:
+    """
+    Returns
+    -------
+    Dict
+        PAD metadata schema, see ``meta/data_structure.json``
+    """
+    global _schema
+    if _schema is None:
+        with _lock:
+            if _schema is None:
+                with open(_schema_file, "r") as f:
+                    _schema = json.load(f)
+    return _schema
+
+
+def _jsonschema():
+    """
+    jsonschema is imported on first validation, reading the metadata does not require it.
+    """
+    try:
+        import jsonschema
+    except ImportError as err:
+        raise ImportError(
+            "jsonschema is required to validate PAD metadata: pip install jsonschema"
+        ) from err
+    return jsonschema
+
+
+def errors() -> Tuple[Type[Exception], ...]:
+    """
+    Returns
+    -------
+    Tuple[Type[Exception], ...]
+        exceptions raised for invalid entries or schema, i.e.
+        ``jsonschema.exceptions.ValidationError`` and ``jsonschema.exceptions.SchemaError``.
+    """
+    jsonschema = _jsonschema()
+    return jsonschema.exceptions.ValidationError, jsonschema.exceptions.SchemaError
+
+
+def get_validator() -> "jsonschema.Draft7Validator":
+    """
+    Validator of the PAD metadata schema. The schema is checked against the metaschema only
+    once and the validator is reused afterwards.
+
+    Returns
+    -------
+    jsonschema.Draft7Validator
+
+    Raises
+    ------
+    jsonschema.exceptions.SchemaError:
+        invalid schema
+    """
+    global _validator
+    if _validator is None:
+        jsonschema = _jsonschema()
+        schema = get_schema()
+        jsonschema.Draft7Validator.check_schema(schema)
+        with _lock:
+            if _validator is None:
+                _validator = jsonschema.Draft7Validator(schema)
+    return _validator
+
+
+def compile_schema(schema: Dict) -> Callable[[Any], bool]:
+    """
+    Compile a JSON schema into a plain Python function which tells if an instance is valid.
+    Only the keywords used by the PAD metadata schema are supported.
+
+    Parameters
+    ----------
+    schema : Dict
+        JSON schema
+
+    Returns
+    -------
+    Callable[[Any], bool]
+        checker
+
+    Raises
+    ------
+    NotImplementedError
+        if the schema uses an unsupported keyword
+    """
+    if schema is True or schema == {}:
+        return lambda x: True
+    if schema is False:
+        return lambda x: False
+
+    checks = []
+    for keyword, value in schema.items():
+        if keyword in _annotations:
+            continue
+        if keyword == "type":
+            types = [_types[x] for x in ([value] if isinstance(value, str) else value)]
+            checks.append(lambda x, types=types: any(check(x) for check in types))
+        elif keyword == "enum":
+            checks.append(lambda x, value=value: x in value)
+        elif keyword == "const":
+            checks.append(lambda x, value=value: x == value)
+        elif keyword == "required":
+            checks.append(
+                lambda x, value=value: not isinstance(x, dict) or all(y in x for y in value)
+            )
+        elif keyword == "properties":
+            properties = {key: compile_schema(sub) for key, sub in value.items()}
+            checks.append(
+                lambda x, properties=properties: not isinstance(x, dict) or all(
+                    check(x[key]) for key, check in properties.items() if key in x
+                )
+            )
+        elif keyword == "additionalProperties":
+            known = list(schema.get("properties", {}).keys())
+            check = compile_schema(value)
+            checks.append(
+                lambda x, known=known, check=check: not isinstance(x, dict) or all(
+                    check(item) for key, item in x.items() if key not in known
+                )
+            )
+        elif keyword == "items" and isinstance(value, dict):
+            check = compile_schema(value)
+            checks.append(
+                lambda x, check=check: not isinstance(x, list) or all(check(y) for y in x)
+            )
+        elif keyword == "anyOf":
+            subschemas = [compile_schema(sub) for sub in value]
+            checks.append(
+                lambda x, subschemas=subschemas: any(check(x) for check in subschemas)
+            )
+        else:
+            raise NotImplementedError(f"Unsupported schema keyword: {keyword}")
+
+    return lambda x: all(check(x) for check in checks)
+
+
+def _get_checker() -> Optional[Callable[[Any], bool]]:
+    global _checker
+    if _checker is None:
+        # make sure that the schema itself is valid
+        get_validator()
+        try:
+            checker = compile_schema(get_schema())
+        except NotImplementedError:
+            checker = False
+        _checker = checker
+    return _checker or None
+
+
+def validate(entries: Sequence[Dict], fast: bool = True) -> None:
+    """
+    Validate PAD entries. Only the given entries are validated, hence after modifying a
+    database it is sufficient to validate the modified entries.
+
+    Parameters
+    ----------
+    entries : Sequence[Dict]
+        PAD entries
+    fast : bool
+        If True, entries are first checked with the compiled schema (see ``compile_schema``)
+        and jsonschema is only used to report the errors of invalid entries.
+
+    Raises
+    ------
+    jsonschema.exceptions.ValidationError:
+        invalid entry
+    jsonschema.exceptions.SchemaError:
+        invalid schema
+    ImportError:
+        jsonschema is not installed
+    """
+    with instrumentation.phase("validate", len(entries)):
+        if fast:
+            checker = _get_checker()
+            if checker is not None and checker(entries):
+                return
+
+        # same error as jsonschema.validate
+        error = _jsonschema().exceptions.best_match(get_validator().iter_errors(entries))
+        if error is not None:
+            raise error
@@ -0,0 +1,120 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from pad_configuration import Configuration  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Serves ``server.files`` {path: content}. ``server.truncated`` {path: bytes} announces the
+    full length but only sends the given number of bytes. Requests are recorded in
+    ``server.requests`` as (path, Range header).
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("Range", None)))
+        content = self.server.files.get(self.path, None)
+        if content is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        start = 0
+        byte_range = self.headers.get("Range", None)
+        if byte_range is not None:
+            start = int(byte_range[len("bytes="):].split("-")[0])
+            if start >= len(content):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(content)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+        else:
+            self.send_response(200)
+        body = content[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        sent = self.server.truncated.get(self.path, None)
+        if sent is not None:
+            self.wfile.write(body[:sent])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    """Local HTTP server, see ``_Handler``. The base URL is ``server.url``."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.files, server.truncated, server.requests = {}, {}, []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Caches are written in a temporary directory instead of the user cache directory."""
+    monkeypatch.setenv("PAD_CACHE_DIR", str(tmp_path / "cache"))
+    return str(tmp_path / "cache")
+
+
+@pytest.fixture(params=["jz", "sqlite"])
+def pad(request, tmp_path, monkeypatch):
+    """
+    Copy of the PADForSFS metadata in a temporary directory, written in the format given by
+    the parameter. Yields the metadata file and the entries.
+    """
+    entries = Configuration("PADForSFS")._asdict()
+    monkeypatch.setitem(
+        Configuration._paddata, "PADForSFS", str(tmp_path / "padforsfs_data.json")
+    )
+    Configuration.clear_cache()
+    yield Configuration.save("PADForSFS", entries, format=request.param), entries
+    Configuration.clear_cache()
@@ -0,0 +1,112 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import os
+
+import pytest
+
+from pad_configuration import Configuration, ConflictError
+from pad_configuration.backends import SQLiteBackend
+
+
+pytestmark = pytest.mark.parametrize("pad", ["sqlite"], indirect=True)
+
+
+def test_round_trip(pad):
+    filename, entries = pad
+    config = Configuration("PADForSFS", lazy=True)
+    assert Configuration._file_format(filename) == "sqlite"
+    assert config._asdict() == entries
+
+    Configuration.save("PADForSFS", config._asdict(), format="jz")
+    assert not os.path.exists(filename) and not os.path.exists(filename + "-wal")
+    Configuration.clear_cache()
+    assert Configuration("PADForSFS")._asdict() == entries
+
+
+def test_single_row_update(pad):
+    filename, _ = pad
+    config = Configuration("PADForSFS")
+    analysis = config[0].name
+    revision = SQLiteBackend(filename).revision()
+    config.add_bibtex_info(analysis, "@misc{test_key,}")
+
+    assert SQLiteBackend(filename).revision() == revision + 1
+    assert SQLiteBackend(filename).get(analysis)["bibtex"][-1] == "@misc{test_key,}"
+    Configuration.clear_cache()
+    assert Configuration("PADForSFS")[0].bibtex[-1] == "@misc{test_key,}"
+
+
+def test_snapshot_detects_modified_entries(pad):
+    filename, entries = pad
+    reader = Configuration("PADForSFS", lazy=True)
+    # another process replaces the first entry
+    modified = dict(entries[0], bibtex=entries[0]["bibtex"] + ["@misc{test_key,}"])
+    SQLiteBackend(filename).update({0: modified}, len(entries))
+
+    # unmodified entries are still read from the snapshot, the modified one is not
+    assert reader[1].name == entries[1]["name"]
+    with pytest.raises(ConflictError):
+        reader[0]
+
+
+def test_edits_do_not_grow_the_wal(pad):
+    filename, _ = pad
+    readers = [Configuration("PADForSFS", lazy=True)]
+    config = Configuration("PADForSFS")
+    analysis = config[0].name
+    for idx in range(200):
+        config.add_json_info(analysis, {"name": f"SR{idx}", "url": "https://localhost/sr.json"})
+        readers.append(Configuration("PADForSFS", lazy=True))
+
+    wal = filename + "-wal"
+    assert not os.path.exists(wal) or os.path.getsize(wal) < 2 * 1024 * 1024
+    assert len(readers[-1][0].url.json) == len(config[0].url.json)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_edits_shared_through_the_cache(pad, lazy):
+    _, entries = pad
+    config = Configuration("PADForSFS", lazy=lazy)
+    config.add_bibtex_info(entries[0]["name"], "@misc{test_key,}")
+    Configuration("PADForSFS", lazy=not lazy).add_json_info(
+        entries[1]["name"], {"name": "SR0", "url": "https://localhost/sr.json"}
+    )
+
+    shared = [Configuration("PADForSFS", lazy=flag)._asdict() for flag in (False, True)]
+    Configuration.clear_cache()
+    assert shared[0] == shared[1] == Configuration("PADForSFS")._asdict()
+    assert shared[0][0]["bibtex"][-1] == "@misc{test_key,}"
+    assert shared[0][1]["url"]["json"][-1]["name"] == "SR0"
+    assert shared[0][2:] == entries[2:]
+
+
+def test_failed_edit_restores_the_entries(pad):
+    _, entries = pad
+    stale = Configuration("PADForSFS")
+    Configuration("PADForSFS").add_bibtex_info(entries[0]["name"], "@misc{test_key,}")
+
+    with pytest.raises(ConflictError):
+        stale.add_bibtex_info(entries[1]["name"], "@misc{other_key,}")
+    assert stale._asdict() == entries
+    assert Configuration("PADForSFS")[1].bibtex == tuple(entries[1]["bibtex"])
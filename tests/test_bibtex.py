@@ -0,0 +1,77 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import json
+import os
+
+import pytest
+
+from pad_configuration import Configuration, bibtex
+
+
+@pytest.fixture
+def records(monkeypatch):
+    """Empty record cache, the file is read again on first use."""
+    monkeypatch.setattr(bibtex, "_records", None)
+    monkeypatch.setattr(bibtex, "_used", {})
+
+
+def test_cache_location(records, cache_dir):
+    package_cache = os.path.join(os.path.dirname(bibtex.__file__), "meta", "bibtex_cache.json")
+    stamp = os.stat(package_cache).st_mtime_ns if os.path.exists(package_cache) else None
+
+    config = Configuration("PAD")
+    config.analyses_citing("10.14428/DVN/P82DKS")
+    assert os.path.isfile(os.path.join(cache_dir, "bibtex_cache.json"))
+    assert (os.stat(package_cache).st_mtime_ns if os.path.exists(package_cache) else None) \
+        == stamp
+
+
+def test_previous_versions_are_pruned(records, cache_dir):
+    other = bibtex.parse_cached(["@article{other_key, title = {Other}}"])
+    bibtex.parse_cached(["@article{test_key, title = {First}}"])
+    bibtex.parse_cached(["@article{test_key, title = {Second}}"])
+
+    with open(os.path.join(cache_dir, "bibtex_cache.json")) as f:
+        stored = json.load(f)
+    assert sorted(record[0] for record in stored.values()) == ["other_key", "test_key"]
+    assert other[0].key == "other_key"
+
+    # records used by other processes are kept
+    bibtex._records, bibtex._used = None, {}
+    bibtex.parse_cached(["@article{third_key, title = {Third}}"])
+    with open(os.path.join(cache_dir, "bibtex_cache.json")) as f:
+        stored = json.load(f)
+    assert sorted(record[0] for record in stored.values()) == [
+        "other_key", "test_key", "third_key"
+    ]
+
+
+def test_read_only_location(records, tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setenv("PAD_CACHE_DIR", str(blocker / "cache"))
+
+    parsed = bibtex.parse_cached(["@article{test_key, title = {First}}"])
+    assert parsed[0].key == "test_key"
+    assert bibtex.parse_cached(["@article{test_key, title = {First}}"]) == parsed
@@ -0,0 +1,57 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import os
+
+from pad_configuration import ArtifactCache
+from pad_configuration.fetch import Downloader
+
+
+def test_fetched_files_are_independent_copies(http_server, tmp_path):
+    http_server.files = {"/a.cpp": b"original"}
+    url = http_server.url + "/a.cpp"
+    cache = ArtifactCache(str(tmp_path / "cache"))
+    first, second = str(tmp_path / "job1" / "a.cpp"), str(tmp_path / "job2" / "a.cpp")
+
+    Downloader(cache).fetch([(url, first)])
+    assert os.stat(first).st_nlink == 1
+    with open(first, "w") as f:
+        f.write("edited")
+
+    Downloader(cache).fetch([(url, second)])
+    assert len(http_server.requests) == 1
+    with open(second, "rb") as f:
+        assert f.read() == b"original"
+
+
+def test_trim_keeps_recently_used_files(http_server, tmp_path):
+    http_server.files = {f"/{idx}.cpp": bytes([idx]) * 100 for idx in range(3)}
+    cache = ArtifactCache(str(tmp_path / "cache"), max_size=250)
+    downloader = Downloader(cache)
+    paths = [downloader.download(f"{http_server.url}/{idx}.cpp") for idx in range(3)]
+    os.utime(paths[0], (0, 0))
+
+    cache.trim()
+    assert cache.size() == 200
+    assert not os.path.exists(paths[0])
+    assert cache.lookup(f"{http_server.url}/0.cpp") is None
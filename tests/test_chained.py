@@ -0,0 +1,126 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import copy
+
+import pytest
+
+from pad_configuration import Configuration
+from pad_configuration.bibtex import citation_key
+from pad_configuration.configuration import ChainedConfiguration
+
+
+@pytest.mark.parametrize("policy", ["first", "last"])
+def test_overridden_entries_are_skipped(policy):
+    config = ChainedConfiguration(Configuration("PAD"), Configuration("PADForSFS"), policy=policy)
+    names = list(config._index)
+
+    selected = list(config.get_collaboration("atlas")) + list(config.get_collaboration("cms"))
+    assert sorted(entry.name for entry in selected) == sorted(names)
+    assert all(entry is config[entry.name] for entry in selected)
+
+    for subset in [config.query(), config.filter("1.11.0", 17)]:
+        assert len(subset) == len(set(subset.keys()))
+        assert all(entry is config[entry.name] for entry in subset)
+
+    assert str(config).count("\n") == len(names) + 2
+    assert sorted(
+        name for line in config.recast_config().splitlines()[2:]
+        for name in line.split("|")[1].split()
+    ) == sorted(names)
+
+
+def test_error_policy():
+    with pytest.raises(AssertionError):
+        ChainedConfiguration(Configuration("PAD"), Configuration("PADForSFS"), policy="error")
+
+
+def test_detector_cards_of_combined_configurations():
+    config = Configuration("PAD") + Configuration("PADForSFS")
+    sfs = next(name for name in config.keys() if config.source(name) == "PADForSFS")
+
+    assert config.artifacts("atlas_exot_2014_06")[3][0] == "delphes_card_atlas_exot_2014_06.tcl"
+    assert config.artifacts(sfs)[3][0].startswith("sfs_card_")
+    assert config.artifacts(sfs)[3][0].endswith(".ma5")
+    assert "delphes_card_atlas_exot_2014_06.tcl" in config.recast_config()
+
+    installation = config.plan_install(["atlas_exot_2014_06", sfs], "v1.10.0", 17)
+    assert {(job.pad, tuple(job.analyses)) for job in installation.jobs} == {
+        ("PAD", ("atlas_exot_2014_06",)), ("PADForSFS", (sfs,))
+    }
+
+
+@pytest.mark.parametrize("policy", ["first", "last"])
+def test_subsets_keep_the_members(policy):
+    config = ChainedConfiguration(Configuration("PAD"), Configuration("PADForSFS"), policy=policy)
+    subsets = [
+        config.filter("v1.9.60", 98), config.query(), config.query(collaboration="atlas")
+    ]
+    for subset in subsets:
+        assert isinstance(subset, ChainedConfiguration)
+        assert all(subset.source(name) == config.source(name) for name in subset._index)
+        assert all(subset[name] is config[name] for name in subset._index)
+
+    subset = subsets[0]
+    sfs = next(name for name in subset._index if subset.source(name) == "PADForSFS")
+    assert subset.artifacts("atlas_exot_2014_06")[3][0] == "delphes_card_atlas_exot_2014_06.tcl"
+    assert subset.artifacts(sfs)[3][0].endswith(".ma5")
+    assert "delphes_card_atlas_exot_2014_06.tcl" in subset.recast_config()
+
+
+@pytest.mark.parametrize("policy", ["first", "last"])
+def test_sequence_interface_skips_overridden_entries(policy, tmp_path):
+    pad = Configuration("PAD")
+    config = ChainedConfiguration(pad, Configuration("PADForSFS"), policy=policy)
+    names = [entry.name for entry in config]
+
+    assert len(config) == len(names) == len(set(names)) == len(config._index)
+    assert list(config.keys()) == names
+    assert all(config[idx] is config[name] for idx, name in enumerate(names))
+    assert [entry["name"] for entry in config._asdict()] == names
+    assert config.export_entries(str(tmp_path / "entries.ndjson")) == len(names)
+    assert set(config.diff(pad)["removed"]) == set(names) - set(pad.keys())
+
+    # atlas_susy_2016_07 is provided by both PADs
+    keys = {citation_key(record) for record in config["atlas_susy_2016_07"].bibtex} - {None}
+    for key in keys:
+        analyses = config._bibliography_index().analyses_of(key)
+        assert len(analyses) == len(set(analyses))
+
+
+def test_nested_chains(pad):
+    _, entries = pad
+    inner = ChainedConfiguration(
+        Configuration("PADForSFS"), Configuration("PAD"), policy="last"
+    )
+    outer = inner + Configuration("PADForMA5tune")
+    # nested chains keep their policy
+    assert outer["atlas_susy_2016_07"] is inner["atlas_susy_2016_07"]
+    assert outer.source("atlas_susy_2016_07") == "PAD"
+
+    entry = copy.deepcopy(entries[0])
+    entry["name"] = "atlas_test_2024_01"
+    inner.members[0].update_entry(entries[0]["name"], entry)
+    assert "atlas_test_2024_01" in outer
+    assert outer.get_analysis(entries[0]["name"]) is None
+    assert outer.source("atlas_test_2024_01") == "PADForSFS"
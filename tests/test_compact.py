@@ -0,0 +1,68 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import copy
+
+import pytest
+
+from pad_configuration import Configuration
+from pad_configuration.compact import CompactPADEntry
+
+
+def test_round_trip():
+    entries = Configuration("PAD")._asdict()
+    assert Configuration("PAD", compact=True)._asdict() == entries
+
+
+def test_additional_url_keys():
+    entry = copy.deepcopy(Configuration("PAD")._asdict()[0])
+    entry["url"]["json"] = [
+        {"name": "SR", "url": "https://localhost/sr.json", "likelihood": "full", "sha256": "0f"}
+    ]
+    entry["url"]["detector"]["version"] = "3.4.2"
+
+    compact = CompactPADEntry.from_dict(entry)
+    assert list(compact.url.json) == entry["url"]["json"]
+    assert Configuration._entry_to_dict(compact) == entry
+
+
+def test_shared_entries_are_read_only():
+    entry = Configuration("PAD", compact=True)[0]
+    name = entry.name
+    for record, field in [(entry, "name"), (entry, "bibtex"), (entry.url, "cpp"), (entry, "_gcc")]:
+        with pytest.raises(AttributeError):
+            setattr(record, field, "test")
+    with pytest.raises(AttributeError):
+        del entry.description
+
+    config = Configuration("PAD", compact=True)
+    assert config[0].name == name
+    assert config[name] is config[0]
+
+
+def test_compact_entries_equal_plain_entries():
+    compact, plain = Configuration("PAD", compact=True), Configuration("PAD")
+    assert all(compact[idx] == plain[idx] for idx in range(len(plain)))
+    assert all(plain[idx] == compact[idx] for idx in range(len(plain)))
+    assert isinstance(compact[0].bibtex, tuple)
+    assert isinstance(compact[0].url.json, tuple)
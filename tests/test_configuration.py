@@ -0,0 +1,106 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import copy
+import os
+import shutil
+
+import pytest
+
+from pad_configuration import Configuration
+
+
+def test_rename_onto_existing_analysis(pad):
+    _, entries = pad
+    config = Configuration("PADForSFS")
+    entry = copy.deepcopy(entries[0])
+    entry["name"] = entries[1]["name"]
+
+    with pytest.raises(AssertionError):
+        config.update_entry(entries[0]["name"], entry)
+    with pytest.raises(AssertionError):
+        (config + Configuration("PAD")).update_entry(entries[0]["name"], entry)
+    assert config._asdict() == entries
+    Configuration.clear_cache()
+    assert Configuration("PADForSFS")._asdict() == entries
+
+
+def test_rename(pad):
+    _, entries = pad
+    config = Configuration("PADForSFS")
+    entry = copy.deepcopy(entries[0])
+    entry["name"] = "atlas_test_2024_01"
+    config.update_entry(entries[0]["name"], entry)
+
+    # entries can also keep their name
+    config.update_entry("atlas_test_2024_01", entry)
+    assert "atlas_test_2024_01" in Configuration("PADForSFS")
+    assert entries[0]["name"] not in Configuration("PADForSFS")
+
+
+def test_shared_entries_are_read_only():
+    entry = Configuration("PAD")[0]
+    with pytest.raises(AttributeError):
+        entry.bibtex.append("@misc{test_key,}")
+    with pytest.raises(TypeError):
+        entry.url.detector["name"] = "test"
+    for item in entry.url.json:
+        with pytest.raises(TypeError):
+            item.update(name="test")
+
+    copied = Configuration("PAD").entry_asdict(entry.name)
+    copied["bibtex"].append("@misc{test_key,}")
+    copied["url"]["detector"]["name"] = "test"
+    assert Configuration("PAD")[0].bibtex == entry.bibtex
+    assert Configuration("PAD")[0].url.detector["name"] != "test"
+
+
+def test_metadata_format_precedence(pad):
+    filename, entries = pad
+    stem = os.path.splitext(filename)[0]
+    # a JSON file copied by hand takes precedence over the newer compressed file
+    shutil.copy(Configuration.save("PADForSFS", entries[:2], compress=False), stem + ".keep")
+    Configuration.save("PADForSFS", entries, format="binary")
+    shutil.move(stem + ".keep", stem + ".json")
+    Configuration.clear_cache()
+    assert len(Configuration("PADForSFS")) == 2
+
+    # saving removes the files of the other formats
+    for format in ["sqlite", "jz", "binary", "json"]:
+        written = Configuration.save("PADForSFS", entries, format=format)
+        assert Configuration._metadata_file("PADForSFS") == written
+        assert [
+            name for name in os.listdir(os.path.dirname(written))
+            if name.startswith(os.path.basename(stem))
+        ] == [os.path.basename(written)]
+        assert Configuration("PADForSFS")._asdict() == entries
+
+
+def test_edits_keep_the_metadata_format(pad):
+    _, entries = pad
+    written = Configuration.save("PADForSFS", entries, compress=False)
+    Configuration("PADForSFS").add_bibtex_info(entries[0]["name"], "@misc{test_key,}")
+
+    assert Configuration._metadata_file("PADForSFS") == written
+    Configuration.clear_cache()
+    assert Configuration("PADForSFS")[0].bibtex[-1] == "@misc{test_key,}"
@@ -0,0 +1,124 @@
+################################################################################
+#
+#  Copyright (C) 2012-2022 Jack Araz, Eric Conte & Benjamin Fuks
+#  The MadAnalysis development team, email: <ma5team@iphc.cnrs.fr>
+#
+#  This file is part of MadAnalysis 5.
+#  Official website: <https://github.com/MadAnalysis/madanalysis5>
+#
+#  MadAnalysis 5 is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  MadAnalysis 5 is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with MadAnalysis 5. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import os
+
+import pytest
+
+from pad_configuration.fetch import ContentStore, Downloader, FetchError
+
+
+def _content(size: int) -> bytes:
+    return bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+
+
+def test_fetch_twice_does_not_request_again(http_server, tmp_path):
+    http_server.files = {"/a.cpp": _content(1000), "/b.h": _content(300)}
+    targets = [(http_server.url + path, str(tmp_path / "dest" / path[1:]))
+               for path in http_server.files]
+
+    Downloader(ContentStore(str(tmp_path / "store"))).fetch(targets)
+    assert len(http_server.requests) == 2
+    for url, target in targets:
+        with open(target, "rb") as f:
+            assert f.read() == http_server.files[url[len(http_server.url):]]
+
+    Downloader(ContentStore(str(tmp_path / "store"))).fetch(targets)
+    assert len(http_server.requests) == 2
+
+
+def test_resume_partial_download(http_server, tmp_path):
+    content = _content(1000)
+    http_server.files = {"/a.cpp": content}
+    store = ContentStore(str(tmp_path / "store"))
+    url = http_server.url + "/a.cpp"
+    with open(store.partial_path(url), "wb") as f:
+        f.write(content[:400])
+
+    path = Downloader(store).download(url)
+    assert http_server.requests == [("/a.cpp", "bytes=400-")]
+    with open(path, "rb") as f:
+        assert f.read() == content
+    assert not os.path.exists(store.partial_path(url))
+
+
+def test_complete_partial_download(http_server, tmp_path):
+    content = _content(1000)
+    http_server.files = {"/a.cpp": content}
+    store = ContentStore(str(tmp_path / "store"))
+    url = http_server.url + "/a.cpp"
+    with open(store.partial_path(url), "wb") as f:
+        f.write(content)
+
+    # 416: the partial file already holds the whole content
+    path = Downloader(store).download(url)
+    assert http_server.requests == [("/a.cpp", "bytes=1000-")]
+    with open(path, "rb") as f:
+        assert f.read() == content
+
+
+def test_stale_partial_download(http_server, tmp_path):
+    content = _content(1000)
+    http_server.files = {"/a.cpp": content}
+    store = ContentStore(str(tmp_path / "store"))
+    url = http_server.url + "/a.cpp"
+    with open(store.partial_path(url), "wb") as f:
+        f.write(_content(1500))
+
+    # 416 with a different size: the partial file is dropped and the file downloaded again
+    path = Downloader(store).download(url)
+    assert http_server.requests == [("/a.cpp", "bytes=1500-"), ("/a.cpp", None)]
+    with open(path, "rb") as f:
+        assert f.read() == content
+
+
+def test_missing_file(http_server, tmp_path):
+    http_server.files = {"/a.cpp": _content(10)}
+    targets = [(http_server.url + "/a.cpp", str(tmp_path / "dest" / "a.cpp")),
+               (http_server.url + "/missing.h", str(tmp_path / "dest" / "missing.h"))]
+
+    with pytest.raises(FetchError, match="HTTP 404"):
+        Downloader(ContentStore(str(tmp_path / "store"))).fetch(targets)
+    # the other files are delivered
+    assert os.path.isfile(targets[0][1])
+    assert not os.path.exists(targets[1][1])
+
+
+def test_truncated_transfer(http_server, tmp_path):
+    content = _content(1000)
+    http_server.files = {"/a.cpp": content}
+    http_server.truncated = {"/a.cpp": 100}
+    store = ContentStore(str(tmp_path / "store"))
+    url = http_server.url + "/a.cpp"
+
+    with pytest.raises(FetchError, match="incomplete transfer, 100 of 1000 bytes"):
+        Downloader(store).download(url)
+    assert store.lookup(url) is None
+    assert os.path.getsize(store.partial_path(url)) == 100
+
+    # the next download resumes the transfer
+    http_server.truncated = {}
+    path = Downloader(store).download(url)
+    assert http_server.requests[-1] == ("/a.cpp", "bytes=100-")
+    with open(path, "rb") as f:
+        assert f.read() == content